@@ -15,8 +15,14 @@ from .lib import (
     EventHandler,
     LyraConfig,
     NodeDataRef,
+    sessions,
     LyraDBClientType,
-    LyraDBCollectionType,
+    AsyncCollection,
+    GuildConfigCache,
+    UnplayableTracks,
+    ResolvedTracks,
+    HistoryLog,
+    ensure_indexes,
     repeat_emojis,
     EmojiCache,
     base_h,
@@ -73,16 +79,9 @@ emoji_cache = EmojiCache({})
 @_client.with_prefix_getter
 async def prefix_getter(
     ctx: tj.abc.MessageContext,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
 ) -> t.Iterable[str]:
-    g_id = str(ctx.guild_id)
-    flt = {'id': g_id}
-
-    if _g_cfg := cfg.find_one(flt):
-        g_cfg = _g_cfg
-    else:
-        cfg.insert_one(flt)
-        g_cfg: dict[str, t.Any] = flt.copy()
+    g_cfg = await cfg.get_or_create(str(ctx.guild_id))
 
     prefixes: list[str] = g_cfg.setdefault('prefixes', []) if ctx.guild_id else []
     return prefixes
@@ -100,11 +99,23 @@ async def on_started(
     logger.info("Fetched emojis from Lýra's Emoji Server")
 
     mongo_client = __init_mongo_client__()
+    await ensure_indexes(mongo_client)
 
     prefs_db = mongo_client.get_database('prefs')
     guilds_co = prefs_db.get_collection('guilds')
+    cfg_cache = GuildConfigCache(AsyncCollection(guilds_co))
 
-    node_data_ref = NodeDataRef({})
+    internal_db = mongo_client.get_database('internal')
+    upt = UnplayableTracks(
+        AsyncCollection(internal_db.get_collection('unplayable-tracks'))
+    )
+    await upt.load()
+    resolved = ResolvedTracks(
+        AsyncCollection(internal_db.get_collection('resolved-tracks'))
+    )
+    history_log = HistoryLog(
+        AsyncCollection(internal_db.get_collection('queue-history'))
+    )
 
     host = (
         os.environ['LAVALINK_HOST']
@@ -127,9 +138,12 @@ async def on_started(
 
     (
         client.set_type_dependency(LyraDBClientType, mongo_client)
-        .set_type_dependency(LyraDBCollectionType, guilds_co)
+        .set_type_dependency(GuildConfigCache, cfg_cache)
+        .set_type_dependency(UnplayableTracks, upt)
+        .set_type_dependency(ResolvedTracks, resolved)
+        .set_type_dependency(HistoryLog, history_log)
         .set_type_dependency(EmojiCache, emoji_cache)
-        .set_type_dependency(NodeDataRef, node_data_ref)
+        .set_type_dependency(NodeDataRef, sessions)
         .set_type_dependency(lv.Lavalink, lvc)
     )
 
@@ -5,10 +5,21 @@ from .connections import cleanup
 from .lava import (
     EventHandler,
     NodeDataRef,
+    sessions,
     repeat_emojis,
     access_data,
     get_data,
     access_equalizer,
 )
-from .dataimpl import LyraDBClientType, LyraDBCollectionType, __init_mongo_client__
+from .dataimpl import (
+    LyraDBClientType,
+    LyraDBCollectionType,
+    AsyncCollection,
+    GuildConfigCache,
+    UnplayableTracks,
+    ResolvedTracks,
+    HistoryLog,
+    ensure_indexes,
+    __init_mongo_client__,
+)
 from .errors import NotConnectedError
@@ -12,6 +12,8 @@ class CommandIdentifier(e.Enum):
     CONFIG_PREFIX_REMOVE = e.auto()
     CONFIG_NOWPLAYINGMSG = e.auto()
     CONFIG_NOWPLAYINGMSG_TOGGLE = e.auto()
+    CONFIG_NODUPLICATES = e.auto()
+    CONFIG_NODUPLICATES_TOGGLE = e.auto()
     CONFIG_RESTRICT = e.auto()
     CONFIG_RESTRICT_LIST = e.auto()
     CONFIG_RESTRICT_ADD = e.auto()
@@ -28,8 +30,11 @@ class CommandIdentifier(e.Enum):
     DEBUG_MODULE_UNLOAD = e.auto()
     DEBUG_COMMAND = e.auto()
     DEBUG_COMMAND_DELETEALL = e.auto()
+    DEBUG_STATS = e.auto()
+    DEBUG_QUEUEMEMORY = e.auto()
 
     NOWPLAYING = e.auto()
+    PLAYINGIN = e.auto()
     SEARCH = e.auto()
     QUEUE = e.auto()
     LYRICS = e.auto()
@@ -46,6 +51,7 @@ class CommandIdentifier(e.Enum):
     REWIND = e.auto()
     SKIP = e.auto()
     PLAYAT = e.auto()
+    PLAYATTIME = e.auto()
     NEXT = e.auto()
     PREVIOUS = e.auto()
     RESTART = e.auto()
@@ -55,6 +61,7 @@ class CommandIdentifier(e.Enum):
     REMOVE = e.auto()
     REMOVE_ONE = e.auto()
     REMOVE_BULK = e.auto()
+    REMOVE_DUPLICATES = e.auto()
     CLEAR = e.auto()
     SHUFFLE = e.auto()
     MOVE = e.auto()
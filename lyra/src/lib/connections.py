@@ -7,7 +7,7 @@ import alluka as al
 import lavasnek_rs as lv
 
 from .extras import Option, Fallible, lgfmt
-from .dataimpl import LyraDBCollectionType
+from .dataimpl import GuildConfigCache
 
 from .utils import (
     DJ_PERMS,
@@ -20,7 +20,12 @@ from .utils import (
     say,
 )
 from .cmd import CommandIdentifier, get_full_cmd_repr_from_identifier
-from .lava import ConnectionCommandsInvokedEvent, NodeDataRef, access_data
+from .lava import (
+    ConnectionCommandsInvokedEvent,
+    NodeDataRef,
+    register_data,
+    unregister_data,
+)
 
 
 logger = logging.getLogger(lgfmt(__name__))
@@ -53,12 +58,9 @@ async def join(
         raise InternalError
 
     bot = ctx.client.get_type_dependency(hk.GatewayBot)
-    cfg = ctx.client.get_type_dependency(LyraDBCollectionType)
-    ndt = ctx.client.get_type_dependency(NodeDataRef)
-    assert (
-        not isinstance(bot, al.abc.Undefined)
-        and not isinstance(cfg, al.abc.Undefined)
-        and not isinstance(ndt, al.abc.Undefined)
+    cfg = ctx.client.get_type_dependency(GuildConfigCache)
+    assert not isinstance(bot, al.abc.Undefined) and not isinstance(
+        cfg, al.abc.Undefined
     )
 
     if channel is None:
@@ -102,19 +104,10 @@ async def join(
     if not (my_perms & (p := hk.Permissions.CONNECT)):
         raise ForbiddenError(p, channel=new_ch)
 
-    g_cfg = cfg.find_one({'id': str(ctx.guild_id)})
-    assert g_cfg
+    policy = await cfg.get_policy(str(ctx.guild_id))
 
-    res_ch = g_cfg.get('restricted_ch', {})
-    res_ch_all: set[int] = {
-        *(
-            map(
-                int,
-                res_ch.get('all', t.cast(list[int], [])),
-            )
-        )
-    }
-    ch_wl: t.Literal[-1, 0, 1] = res_ch.get('wl_mode', 0)
+    res_ch_all = policy.ch_all
+    ch_wl = policy.ch_wl
 
     author_perms = await tj.permissions.fetch_permissions(
         ctx.client, ctx.member, channel=ctx.channel_id
@@ -135,9 +128,8 @@ async def join(
     # Lavasnek tells lavalink to connect
     await lvc.create_session(sess_conn)
 
-    async with access_data(ctx, lvc) as d:
-        ndt.setdefault(ctx.guild_id, d)
-        d.out_channel_id = ctx.channel_id
+    d = await register_data(ctx.guild_id, lvc)
+    d.out_channel_id = ctx.channel_id
 
     is_stage = isinstance(ctx.cache.get_guild_channel(new_ch), hk.GuildStageChannel)
     ch_type = 'stage' if is_stage else 'channel'
@@ -250,7 +242,7 @@ async def cleanup(
         if d.out_channel_id and d.nowplaying_msg:
             await bot.rest.delete_messages(d.out_channel_id, d.nowplaying_msg)
     await lvc.wait_for_connection_info_remove(guild)
-    ndt.pop(guild)
+    unregister_data(guild)
     await lvc.remove_guild_node(guild)
     await lvc.remove_guild_from_loops(guild)
 
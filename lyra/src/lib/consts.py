@@ -10,14 +10,42 @@ Q_CHUNK: t.Final = 10
 """Amount of tracks in the queue to be displayed per page in the `/queue` command"""
 RETRIES: t.Final = 3
 """Amount of tries to retry when some over-the-web operations failed"""
-STOP_REFRESH: t.Final = 0.15
-"""How many seconds to wait before checking the next time whether the track is confirmed to be stopped"""
 ADD_TRACKS_WRAP_LIM: t.Final = 3
 """How many tracks to be displayed in `/play`'s output before the text got summarized to "Added <i> tracks...\""""
 INACTIVITY_TIMEOUT: t.Final = 600
 """Timeout duration for the automatic inactivity disconnection in seconds"""
 INACTIVITY_REFRESH: t.Final = 10
 """Amount of timeout refreshes to periodically check whether the inactivity condition is still met"""
+DB_IO_WORKERS: t.Final = 8
+"""Amount of threads dedicated to running the blocking database calls"""
+TRACK_LOAD_CONCURRENCY: t.Final = 5
+"""How many songs of a multi-song `/play` query are allowed to be loaded from Lavalink at once"""
+TRACK_CACHE_SIZE: t.Final = 1024
+"""How many distinct track-load results are kept in memory before the least recently used one is evicted"""
+TRACK_CACHE_TTL: t.Final = 3600
+"""How many seconds a cached track-load result stays valid for"""
+EMPTY_TRACK_CACHE_SIZE: t.Final = 256
+"""How many queries that loaded no tracks are remembered before the least recently used one is evicted"""
+EMPTY_TRACK_CACHE_TTL: t.Final = 300
+"""How many seconds a query that loaded no tracks is remembered for, kept short so that a transient failure isn't cached for long"""
+DECODED_TRACK_CACHE_SIZE: t.Final = 256
+"""How many decoded tracks the bot didn't queue itself are kept in memory before the least recently used ones are evicted"""
+DECODED_TRACK_CACHE_TTL: t.Final = 3600
+"""How many seconds a decoded track the bot didn't queue itself is remembered for"""
+RESOLVED_TRACKS_MAX: t.Final = 100_000
+"""How many resolved search queries are persisted in the database before the oldest ones are trimmed"""
+RESOLVED_TRACKS_TTL: t.Final = 14 * 24 * 60 * 60
+"""How many seconds a persisted resolved search query stays in the database for before it expires"""
+RESOLVED_TRACKS_TRIM_EVERY: t.Final = 500
+"""How many resolved search queries are persisted in between each check of whether the store has grown past its limit"""
+LAZY_SHUFFLE_MIN: t.Final = 1000
+"""How many upcoming tracks there must be before shuffling them on enqueue is done lazily, one track at a time as they're played"""
+HISTORY_MAX: t.Final = 500
+"""How many played tracks a queue keeps in memory before the oldest ones are spilled to the database"""
+HISTORY_SPILL_BATCH: t.Final = 100
+"""How many played tracks past `HISTORY_MAX` a queue lets pile up before spilling them all at once, so that the front of the queue is shifted once per batch instead of once per track"""
+HISTORY_LOG_TTL: t.Final = 7 * 24 * 60 * 60
+"""How many seconds a played track spilled out of a queue stays in the database for before it expires"""
 
 
 genius_icon: t.Final = (
@@ -1,11 +1,32 @@
 import os
+import copy
 import typing as t
+import time
+import asyncio
+import datetime as dt
 import logging
+import functools as ft
+import concurrent.futures as cf
 
+import attr as a
+import pymongo as mg
+import pymongo.errors as mg_er
 import pymongo.collection as mg_co
 import pymongo.mongo_client as mg_cl
 
-from .extras import lgfmt
+from .consts import (
+    DB_IO_WORKERS,
+    RESOLVED_TRACKS_MAX,
+    RESOLVED_TRACKS_TTL,
+    RESOLVED_TRACKS_TRIM_EVERY,
+    HISTORY_LOG_TTL,
+    TRACK_CACHE_SIZE,
+    TRACK_CACHE_TTL,
+)
+from .extras import Option, TTLCache, lgfmt
+
+if t.TYPE_CHECKING:
+    from .lava import QueueEntry
 
 # import firebase_admin as fb
 
@@ -41,14 +62,510 @@ logger = logging.getLogger(lgfmt(__name__))
 #     logger.info("Saved to guild_configs")
 
 
-conn_str = os.environ['MONGODB_CONN_STR']
-pwd = os.environ['MONGODB_PWD']
-
 LyraDBDocumentType = dict[str, t.Any]
 LyraDBClientType = mg_cl.MongoClient[LyraDBDocumentType]
 LyraDBCollectionType = mg_co.Collection[LyraDBDocumentType]
+LyraDBUpdateType = t.Mapping[str, t.Any]
+"""Either an update document made of update operators such as `$set` or `$pull`, or an aggregation pipeline"""
+
+if os.environ.get('MONGODB_MOCK', False):
+    import mongomock as mg_mock  # pyright: ignore [reportMissingTypeStubs]
+
+    _client = t.cast(LyraDBClientType, mg_mock.MongoClient())
+else:
+    conn_str = os.environ['MONGODB_CONN_STR']
+    pwd = os.environ['MONGODB_PWD']
+
+    _client: LyraDBClientType = mg_cl.MongoClient(conn_str % pwd)
+
+_io_pool: t.Final = cf.ThreadPoolExecutor(
+    max_workers=DB_IO_WORKERS, thread_name_prefix='lyra-db'
+)
+
+_T = t.TypeVar('_T')
+_P = t.ParamSpec('_P')
+
+
+@a.frozen
+class AsyncCollection:
+    """
+    Runs the blocking calls of a pymongo-compatible collection on a dedicated I/O thread pool, so that the event loop is never stalled by the database
+
+    Anything that quacks like a `pymongo.collection.Collection`, such as a `mongomock` collection, can be wrapped
+    """
+
+    collection: LyraDBCollectionType
+
+    async def _run(
+        self, func: t.Callable[_P, _T], /, *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_io_pool, ft.partial(func, *args, **kwargs))
+
+    async def find_one(
+        self, flt: t.Mapping[str, t.Any], /
+    ) -> Option[LyraDBDocumentType]:
+        return await self._run(self.collection.find_one, flt)
+
+    async def find(
+        self, flt: Option[t.Mapping[str, t.Any]] = None, /
+    ) -> list[LyraDBDocumentType]:
+        return await self._run(lambda: [*self.collection.find(flt)])
+
+    async def insert_one(self, doc: LyraDBDocumentType, /) -> None:
+        await self._run(
+            self.collection.insert_one,  # pyright: ignore [reportUnknownMemberType]
+            doc,
+        )
+
+    async def insert_many(self, docs: t.Sequence[LyraDBDocumentType], /) -> None:
+        await self._run(
+            self.collection.insert_many,  # pyright: ignore [reportUnknownMemberType]
+            docs,
+        )
+
+    async def find_one_and_replace(
+        self, flt: t.Mapping[str, t.Any], doc: LyraDBDocumentType, /
+    ) -> Option[LyraDBDocumentType]:
+        return await self._run(self.collection.find_one_and_replace, flt, doc)
+
+    async def find_one_and_update(
+        self,
+        flt: t.Mapping[str, t.Any],
+        update: LyraDBUpdateType,
+        /,
+        *,
+        upsert: bool = False,
+    ) -> Option[LyraDBDocumentType]:
+        return await self._run(
+            self.collection.find_one_and_update,
+            flt,
+            update,
+            upsert=upsert,
+            return_document=mg_co.ReturnDocument.AFTER,
+        )
+
+    async def update_one(
+        self,
+        flt: t.Mapping[str, t.Any],
+        update: LyraDBUpdateType,
+        /,
+        *,
+        upsert: bool = False,
+    ) -> None:
+        await self._run(self.collection.update_one, flt, update, upsert=upsert)
+
+    async def find_one_and_delete(
+        self, flt: t.Mapping[str, t.Any], /, *, sort: Option[tuple[str, int]] = None
+    ) -> Option[LyraDBDocumentType]:
+        return await self._run(
+            self.collection.find_one_and_delete, flt, sort=sort and [sort]
+        )
+
+    async def delete_many(self, flt: t.Mapping[str, t.Any], /) -> None:
+        await self._run(self.collection.delete_many, flt)
+
+    async def count_documents(self, flt: t.Mapping[str, t.Any], /) -> int:
+        return await self._run(self.collection.count_documents, flt)
+
+    async def find_sorted(
+        self,
+        flt: t.Mapping[str, t.Any],
+        key: str,
+        /,
+        *,
+        limit: int = 0,
+        descending: bool = False,
+    ) -> list[LyraDBDocumentType]:
+        direction = mg.DESCENDING if descending else mg.ASCENDING
+        return await self._run(
+            lambda: [*self.collection.find(flt).sort(key, direction).limit(limit)]
+        )
+
+    async def create_index(
+        self, key: str, /, *, unique: bool = False, expire_after: Option[int] = None
+    ) -> str:
+        kwargs: dict[str, t.Any] = {'unique': unique}
+        if expire_after is not None:
+            kwargs['expireAfterSeconds'] = expire_after
+        return await self._run(self.collection.create_index, key, **kwargs)
+
+    async def explain_find(self, flt: t.Mapping[str, t.Any], /) -> dict[str, t.Any]:
+        return await self._run(lambda: self.collection.find(flt).explain())
+
+
+BlacklistMode = t.Literal[-1, 0, 1]
+
+
+@a.frozen
+class RestrictionPolicy:
+    """A guild's restricted channels, roles and members, compiled from its config into frozensets for cheap lookups"""
+
+    ch_all: frozenset[int] = frozenset()
+    r_all: frozenset[int] = frozenset()
+    u_all: frozenset[int] = frozenset()
+    ch_wl: BlacklistMode = 0
+    r_wl: BlacklistMode = 0
+    u_wl: BlacklistMode = 0
+
+    @classmethod
+    def from_cfg(cls, g_cfg: LyraDBDocumentType, /):
+        res_ch: dict[str, t.Any] = g_cfg.get('restricted_ch', {})
+        res_r: dict[str, t.Any] = g_cfg.get('restricted_r', {})
+        res_u: dict[str, t.Any] = g_cfg.get('restricted_u', {})
+
+        return cls(
+            ch_all=frozenset(map(int, res_ch.get('all', ()))),
+            r_all=frozenset(map(int, res_r.get('all', ()))),
+            u_all=frozenset(map(int, res_u.get('all', ()))),
+            ch_wl=res_ch.get('wl_mode', 0),
+            r_wl=res_r.get('wl_mode', 0),
+            u_wl=res_u.get('wl_mode', 0),
+        )
+
+
+@a.define
+class GuildConfigCache:
+    """
+    A write-through, in-memory cache in front of the guild configs collection
+
+    Reads of a single guild's config by its `id` are served from memory after the first lookup. Every document handed out is a copy, so edits made by the callers never reach the cache unless they are written back through this object. Writes of the same guild are applied in the order they were made, while other guilds are never held up
+    """
+
+    collection: AsyncCollection
+    hits: int = a.field(default=0, init=False)
+    misses: int = a.field(default=0, init=False)
+    _docs: dict[str, LyraDBDocumentType] = a.field(factory=dict, init=False)
+    _policies: dict[str, RestrictionPolicy] = a.field(factory=dict, init=False)
+    _locks: dict[str, asyncio.Lock] = a.field(factory=dict, init=False)
+
+    @staticmethod
+    def _key(flt: t.Mapping[str, t.Any], /) -> Option[str]:
+        if len(flt) == 1 and isinstance(g_id := flt.get('id'), str):
+            return g_id
+        return None
+
+    def _lock(self, key: Option[str], /) -> asyncio.Lock:
+        if key is None:
+            return asyncio.Lock()
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    async def find_one(
+        self, flt: t.Mapping[str, t.Any], /
+    ) -> Option[LyraDBDocumentType]:
+        if (key := self._key(flt)) is None:
+            return await self.collection.find_one(flt)
+
+        if (doc := self._docs.get(key)) is not None:
+            self.hits += 1
+            return copy.deepcopy(doc)
+
+        self.misses += 1
+        if (doc := await self.collection.find_one(flt)) is None:
+            return None
+        if key not in self._docs:
+            self._docs[key] = copy.deepcopy(doc)
+        return copy.deepcopy(self._docs[key])
+
+    async def get_or_create(self, g_id: str, /) -> LyraDBDocumentType:
+        """Gets a guild's config, creating an empty one first if the guild has none yet. The new document is upserted, so that concurrent first lookups of the same guild never clash on the unique `id` index"""
+
+        flt = {'id': g_id}
+        if (doc := await self.find_one(flt)) is not None:
+            return doc
+        return await self.update_one(flt, {'$setOnInsert': flt}) or flt
+
+    async def find_one_and_replace(
+        self, flt: t.Mapping[str, t.Any], doc: LyraDBDocumentType, /
+    ) -> Option[LyraDBDocumentType]:
+        key = self._key(flt)
+        async with self._lock(key):
+            old = await self.collection.find_one_and_replace(flt, doc)
+            if key is not None:
+                self._store(key, doc)
+            return old
+
+    async def update_one(
+        self, flt: t.Mapping[str, t.Any], update: LyraDBUpdateType, /
+    ) -> Option[LyraDBDocumentType]:
+        """Atomically applies `update` on the server, creating the document if it doesn't exist yet, then refreshes the cache with the updated document"""
+
+        key = self._key(flt)
+        async with self._lock(key):
+            doc = await self.collection.find_one_and_update(flt, update, upsert=True)
+            if key is not None and doc is not None:
+                self._store(key, doc)
+            return doc
+
+    async def toggle(self, g_id: str, field: str, /) -> bool:
+        """Flips a boolean field of a guild's config, treating a missing one as `False`, and returns its new value. The current value is read and written back under the guild's lock, so that concurrent toggles don't cancel each other out"""
+
+        flt = {'id': g_id}
+        async with self._lock(g_id):
+            g_cfg = await self.find_one(flt) or {}
+            value = not g_cfg.get(field, False)
+            doc = await self.collection.find_one_and_update(
+                flt, {'$set': {field: value}}, upsert=True
+            )
+            if doc is not None:
+                self._store(g_id, doc)
+        return value
+
+    def _store(self, key: str, doc: LyraDBDocumentType, /) -> None:
+        self._docs[key] = copy.deepcopy(doc)
+        self._policies.pop(key, None)
+
+    async def get_policy(self, g_id: str, /) -> RestrictionPolicy:
+        """Gets the compiled restriction policy of a guild, which is rebuilt only after its config has been written to. A guild without a config gets an empty policy, which is cached all the same, so that it doesn't look up its missing config on every command"""
+
+        if (policy := self._policies.get(g_id)) is not None:
+            self.hits += 1
+            return policy
+
+        if (g_cfg := self._docs.get(g_id)) is None:
+            g_cfg = await self.find_one({'id': g_id}) or {}
+        else:
+            self.hits += 1
+
+        policy = self._policies[g_id] = (
+            RestrictionPolicy.from_cfg(g_cfg) if g_cfg else RestrictionPolicy()
+        )
+        return policy
+
+    def invalidate(self, g_id: Option[str] = None, /) -> None:
+        if g_id is None:
+            self._docs.clear()
+            self._policies.clear()
+            return
+        self._docs.pop(g_id, None)
+        self._policies.pop(g_id, None)
+
+
+@a.define
+class UnplayableTracks:
+    """
+    An in-memory blocklist of the identifiers of the tracks that failed to play
+
+    The whole collection is loaded once at startup, so checking a track against it doesn't depend on how many tracks have been blocklisted
+    """
+
+    collection: AsyncCollection
+    _identifiers: set[str] = a.field(factory=set, init=False)
+
+    def __contains__(self, identifier: str, /) -> bool:
+        return identifier in self._identifiers
+
+    def __len__(self) -> int:
+        return len(self._identifiers)
+
+    async def load(self) -> None:
+        self._identifiers = {doc['identifier'] for doc in await self.collection.find()}
+        logger.info(f"Loaded {len(self)} unplayable track(s)")
+
+    async def add(self, identifier: str, /) -> None:
+        if identifier in self._identifiers:
+            return
+        self._identifiers.add(identifier)
+        flt = {'identifier': identifier}
+        await self.collection.update_one(flt, {'$setOnInsert': flt}, upsert=True)
+
+
+# `ResolvedTracks` and `HistoryLog` store a track as its direct URI, which is loaded from
+# Lavalink again when it's needed, as a track can't be rebuilt from its encoded form alone
+
+
+@a.define
+class ResolvedTracks:
+    """A persistent store of the track URI each search query resolved to, which expires after `RESOLVED_TRACKS_TTL` seconds and is trimmed past `RESOLVED_TRACKS_MAX` entries"""
+
+    collection: AsyncCollection
+    hits: int = a.field(default=0, init=False)
+    misses: int = a.field(default=0, init=False)
+    _puts: int = a.field(default=0, init=False)
+    _writes: set[asyncio.Task[None]] = a.field(factory=set, init=False)
+    _uris: TTLCache[str, str] = a.field(
+        factory=lambda: TTLCache(TRACK_CACHE_SIZE, TRACK_CACHE_TTL), init=False
+    )
+
+    async def get(self, query: str, /) -> Option[str]:
+        if (uri := self._uris.get(query)) is not None:
+            self.hits += 1
+            return uri
+        if doc := await self.collection.find_one({'query': query}):
+            self.hits += 1
+            uri = self._uris[query] = doc['uri']
+            return uri
+        self.misses += 1
+        return None
+
+    async def put(self, query: str, uri: str, title: str, /) -> None:
+        await self.collection.update_one(
+            {'query': query},
+            {
+                '$set': {
+                    'uri': uri,
+                    'title': title,
+                    'stored_at': dt.datetime.now(dt.timezone.utc),
+                }
+            },
+            upsert=True,
+        )
+        self._uris[query] = uri
+        self._puts += 1
+        if self._puts % RESOLVED_TRACKS_TRIM_EVERY == 0:
+            await self.trim()
+
+    def put_soon(self, query: str, uri: str, title: str, /) -> None:
+        """Schedules a `put` in the background, so that a search never waits on the store"""
+
+        async def write():
+            try:
+                await self.put(query, uri, title)
+            except mg_er.PyMongoError as exc:
+                logger.warning(
+                    f"Failed to store the resolved track of {query!r}: {exc}"
+                )
+
+        self._writes.add(task := asyncio.create_task(write()))
+        task.add_done_callback(self._writes.discard)
+
+    async def discard(self, query: str, /) -> None:
+        self._uris.pop(query)
+        await self.collection.delete_many({'query': query})
+
+    async def trim(self) -> None:
+        excess = await self.collection.count_documents({}) - RESOLVED_TRACKS_MAX
+        if excess <= 0:
+            return
+        oldest = await self.collection.find_sorted({}, 'stored_at', limit=excess)
+        await self.collection.delete_many({'_id': {'$in': [d['_id'] for d in oldest]}})
+        logger.info(f"Trimmed {len(oldest)} resolved track(s)")
+
+
+@a.define
+class HistoryLog:
+    """An append-only log of the played tracks spilled out of each queue past `HISTORY_MAX`, keyed by its `history_id`, which expires after `HISTORY_LOG_TTL` seconds"""
+
+    collection: AsyncCollection
+
+    async def append(
+        self, history_id: str, entries: t.Iterable['QueueEntry'], /
+    ) -> None:
+        now = dt.datetime.now(dt.timezone.utc)
+        docs = [
+            {
+                'history_id': history_id,
+                'uri': e.meta.uri or e.meta.identifier,
+                'title': e.title,
+                'length': e.length,
+                'requester': int(e.requester),
+                'at': now,
+            }
+            for e in entries
+        ]
+        if docs:
+            await self.collection.insert_many(docs)
+
+    async def page(
+        self, history_id: str, /, *, limit: int, before: t.Any = None
+    ) -> list[LyraDBDocumentType]:
+        """Returns up to `limit` spilled entries of a queue, newest first, starting after the entry whose `_id` is `before` if given"""
+
+        flt: dict[str, t.Any] = {'history_id': history_id}
+        if before is not None:
+            flt['_id'] = {'$lt': before}
+        return await self.collection.find_sorted(
+            flt, '_id', limit=limit, descending=True
+        )
+
+    async def pop(self, history_id: str, /) -> Option[LyraDBDocumentType]:
+        """Removes and returns the most recently spilled entry of a queue"""
+
+        return await self.collection.find_one_and_delete(
+            {'history_id': history_id}, sort=('_id', mg.DESCENDING)
+        )
+
+
+@a.frozen
+class IndexSpec:
+    """A lookup key the bot queries a collection by, which must be backed by an index"""
+
+    database: str
+    collection: str
+    key: str
+    unique: bool = True
+    expire_after: Option[int] = None
+
+
+INDEX_SPECS: t.Final = (
+    IndexSpec('prefs', 'guilds', 'id'),
+    IndexSpec('internal', 'unplayable-tracks', 'identifier'),
+    IndexSpec('internal', 'resolved-tracks', 'query'),
+    IndexSpec(
+        'internal',
+        'resolved-tracks',
+        'stored_at',
+        unique=False,
+        expire_after=RESOLVED_TRACKS_TTL,
+    ),
+    IndexSpec('internal', 'queue-history', 'history_id', unique=False),
+    IndexSpec(
+        'internal',
+        'queue-history',
+        'at',
+        unique=False,
+        expire_after=HISTORY_LOG_TTL,
+    ),
+)
+"""Every collection lookup key that must be indexed before the bot starts serving commands"""
+
+
+def _find_stages(plan: t.Any, /) -> t.Iterator[str]:
+    if isinstance(plan, dict):
+        plan = t.cast(dict[str, t.Any], plan)
+        if isinstance(stage := plan.get('stage'), str):
+            yield stage
+        for v in plan.values():
+            yield from _find_stages(v)
+    elif isinstance(plan, list):
+        for v in t.cast(list[t.Any], plan):
+            yield from _find_stages(v)
+
+
+async def ensure_indexes(client: LyraDBClientType, /) -> None:
+    """Idempotently creates the indexes in `INDEX_SPECS`, then warns on any of their lookups that still plan a collection scan"""
+
+    for spec in INDEX_SPECS:
+        co = AsyncCollection(
+            client.get_database(  # pyright: ignore [reportUnknownMemberType]
+                spec.database
+            ).get_collection(spec.collection)
+        )
+        name = f"{spec.database}.{spec.collection}.{spec.key}"
+
+        start = time.perf_counter()
+        try:
+            await co.create_index(
+                spec.key, unique=spec.unique, expire_after=spec.expire_after
+            )
+        except mg_er.OperationFailure as exc:
+            logger.error(f"Failed to build the index on {name}: {exc}")
+            continue
+        logger.info(
+            f"Ensured index on {name} in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
 
-_client: LyraDBClientType = mg_cl.MongoClient(conn_str % pwd)
+        try:
+            plan = await co.explain_find({spec.key: None})
+        except (NotImplementedError, AttributeError, mg_er.PyMongoError):
+            continue
+        if 'COLLSCAN' in _find_stages(plan.get('queryPlanner', plan)):
+            logger.warning(f"Lookups on {name} still plan a collection scan")
 
 
 def __init_mongo_client__():
@@ -21,6 +21,7 @@ from .errors import (
     QueryEmptyError,
     TrackStoppedError,
     NoPlayableTracksError,
+    AlreadyQueuedError,
     NotDeveloperError,
     VotingTimeoutError,
     ForbiddenError,
@@ -3,10 +3,12 @@ import typing as t
 
 import attr as a
 import hikari as hk
-import lavasnek_rs as lv
 
 from ..extras import Option
 
+if t.TYPE_CHECKING:
+    from ..lava import QueueEntry
+
 
 @a.frozen
 class Argument:
@@ -130,7 +132,7 @@ class InternalError(PlaybackException):
 
 @a.frozen
 class PlaybackChangeRefused(PlaybackException):
-    track: Option[lv.TrackQueue] = None
+    track: Option['QueueEntry'] = None
 
 
 @a.frozen(init=False)
@@ -168,6 +170,11 @@ class NoPlayableTracksError(BaseLyraError):
     pass
 
 
+@a.frozen(init=False)
+class AlreadyQueuedError(BaseLyraError):
+    pass
+
+
 @a.frozen(init=False)
 class VotingTimeoutError(TimeoutError, BaseLyraError):
     pass
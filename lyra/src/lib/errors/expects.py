@@ -27,6 +27,7 @@ from .errors import (
     QueryEmptyError,
     TrackStoppedError,
     NoPlayableTracksError,
+    AlreadyQueuedError,
     NotDeveloperError,
 )
 
@@ -148,6 +149,11 @@ class CheckErrorExpects(BaseErrorExpects):
     async def expect_no_playable_tracks(self):
         await err_say(self.context, content="💔 Cannot play any given track(s)")
 
+    async def expect_already_queued(self):
+        await err_say(
+            self.context, content="♊ Every given track is already in the queue"
+        )
+
     async def expect_not_developer(self):
         await err_say(self.context, content="🚫⚙️ Reserved for bot's developers only")
 
@@ -183,6 +189,8 @@ class CheckErrorExpects(BaseErrorExpects):
                 return lambda: self.expect_query_empty(error)
             case NoPlayableTracksError():
                 return lambda: self.expect_no_playable_tracks()
+            case AlreadyQueuedError():
+                return lambda: self.expect_already_queued()
             case NotDeveloperError():
                 return lambda: self.expect_not_developer()
             case _:
@@ -27,6 +27,10 @@ from .untyped import (
 from .funcs import (
     AutoDocsFlag,
     List,
+    TTLCache,
+    SingleFlight,
+    FenwickTree,
+    TrigramIndex,
     RecurserSig,
     lgfmt,
     inj_glob,
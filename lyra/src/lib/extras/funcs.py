@@ -2,7 +2,9 @@ import os
 import time
 import enum as e
 import typing as t
+import heapq
 import inspect
+import asyncio
 import pathlib as pl
 import functools as ft
 import itertools as it
@@ -96,7 +98,8 @@ class List(list[_E]):
         map_in_place(func, self, predicate=predicate)
 
     def filter_sub(self, predicate: Option[PredicateSig[_E]] = None):
-        self.map_in_place(lambda e: self.remove(e), predicate=predicate)
+        predicate = predicate or (lambda _: True)
+        self[:] = [e for e in self if not predicate(e)]
 
     @property
     def length(self) -> int:
@@ -110,6 +113,208 @@ class List(list[_E]):
             self.remove(e)
 
 
+_KT = t.TypeVar('_KT', bound=t.Hashable)
+_VT = t.TypeVar('_VT')
+
+
+class TTLCache(t.Generic[_KT, _VT]):
+    """A size-bounded mapping that evicts its least recently used entry when full and forgets every entry `ttl` seconds after it was stored"""
+
+    def __init__(self, maxsize: int, ttl: float, /):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: cl.OrderedDict[_KT, tuple[float, _VT]] = cl.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: _KT, /) -> bool:
+        return self._peek(key) is not None
+
+    def __setitem__(self, key: _KT, value: _VT, /) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _peek(self, key: _KT, /) -> Option[tuple[float, _VT]]:
+        if (entry := self._data.get(key)) is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: _KT, /) -> Option[_VT]:
+        if (entry := self._peek(key)) is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def pop(self, key: _KT, /) -> Option[_VT]:
+        entry = self._data.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / total if (total := self.hits + self.misses) else 0.0
+
+
+class FenwickTree:
+    """A binary indexed tree over a sequence of integers, answering prefix sums and point updates in O(log n)"""
+
+    def __init__(self, values: t.Iterable[int] = (), /):
+        tree = [0, *values]
+        for i in range(1, len(tree)):
+            if (j := i + (i & -i)) < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def append(self, value: int, /) -> None:
+        n = len(self._tree)
+        self._tree.append(
+            value + self.prefix_sum(n - 1) - self.prefix_sum(n - (n & -n))
+        )
+
+    def splice(self, i: int, values: t.Iterable[int], /) -> None:
+        """Replaces every value from the `i`-th one onwards with `values`, recomputing only the nodes that cover them"""
+
+        tree = self._tree
+        del tree[i + 1 :]
+        base = acc = self.prefix_sum(i)
+        sums: list[int] = []
+        for v in values:
+            sums.append(acc := acc + v)
+            # Only the nodes whose range starts before `i` need a sum from the kept nodes
+            lo = (j := len(tree)) - (j & -j)
+            if lo > i:
+                tree.append(acc - sums[lo - i - 1])
+            else:
+                tree.append(acc - (base if lo == i else self.prefix_sum(lo)))
+
+    def add(self, i: int, delta: int, /) -> None:
+        i += 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, stop: int, /) -> int:
+        """Sums the first `stop` values"""
+
+        stop = min(stop, len(self))
+        sum_ = 0
+        while stop > 0:
+            sum_ += self._tree[stop]
+            stop -= stop & -stop
+        return sum_
+
+    def search(self, value: int, /) -> int:
+        """Finds how many of the leading values can be summed up without exceeding `value`, assuming none of the values are negative"""
+
+        i = 0
+        step = 1 << len(self).bit_length()
+        while step:
+            if (j := i + step) <= len(self) and self._tree[j] <= value:
+                i = j
+                value -= self._tree[j]
+            step >>= 1
+        return i
+
+
+class TrigramIndex(t.Generic[_VT]):
+    """An inverted index from the character trigrams of a text to the entries bearing it, ranking fuzzy lookups without comparing against every entry"""
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = {}
+        self._entries: dict[int, tuple[_VT, frozenset[str]]] = {}
+        self._refs: cl.Counter[int] = cl.Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def trigrams(text: str, /) -> frozenset[str]:
+        text = f"  {' '.join(text.casefold().split())} "
+        return frozenset(text[i : i + 3] for i in range(len(text) - 2))
+
+    def add(self, entry: _VT, text: str, /) -> None:
+        self._refs[k := id(entry)] += 1
+        if k in self._entries:
+            return
+        self._entries[k] = (entry, grams := self.trigrams(text))
+        for g in grams:
+            self._postings.setdefault(g, set()).add(k)
+
+    def discard(self, entry: _VT, /) -> None:
+        k = id(entry)
+        if k not in self._refs:
+            return
+        self._refs[k] -= 1
+        if self._refs[k] > 0:
+            return
+        del self._refs[k]
+        for g in self._entries.pop(k)[1]:
+            (ks := self._postings[g]).discard(k)
+            if not ks:
+                del self._postings[g]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._entries.clear()
+        self._refs.clear()
+
+    def search(self, text: str, /, *, limit: int = 1) -> list[tuple[_VT, float]]:
+        """Ranks the entries sharing any trigram with `text` by their trigram similarity to it, best first"""
+
+        grams = self.trigrams(text)
+        shared: cl.Counter[int] = cl.Counter()
+        for g in grams:
+            shared.update(self._postings.get(g, ()))
+
+        def score(k: int, n: int) -> float:
+            return n / (len(grams) + len(self._entries[k][1]) - n)
+
+        best = heapq.nlargest(limit, shared.items(), key=lambda kn: score(*kn))
+        return [(self._entries[k][0], score(k, n)) for k, n in best]
+
+
+class SingleFlight(t.Generic[_KT, _VT]):
+    """Coalesces concurrent calls sharing the same key into a single call, whose result every caller awaits. The call runs as its own task, so cancelling any of the callers, including the first one, never cancels it for the others"""
+
+    def __init__(self):
+        self.collapsed = 0
+        self._inflight: dict[_KT, asyncio.Future[_VT]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: _KT, func: t.Callable[[], t.Awaitable[_VT]], /) -> _VT:
+        if (fut := self._inflight.get(key)) is not None:
+            self.collapsed += 1
+            return await asyncio.shield(fut)
+
+        fut = self._inflight[key] = asyncio.ensure_future(func())
+
+        def done(f: asyncio.Future[_VT]) -> None:
+            del self._inflight[key]
+            # Mark the exception as retrieved, in case every caller was cancelled before it
+            if not f.cancelled():
+                f.exception()
+
+        fut.add_done_callback(done)
+        return await asyncio.shield(fut)
+
+
 def curr_time_ms() -> int:
     return time.time_ns() // 1_000_000
 
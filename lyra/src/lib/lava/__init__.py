@@ -1,8 +1,13 @@
 # pyright: reportUnusedImport=false
 from .utils import (
     NodeData,
+    GuildActor,
     NodeDataRef,
+    sessions,
+    QueueEntry,
+    TrackMeta,
     QueueList,
+    QueueView,
     Bands,
     RepeatMode,
     Trackish,
@@ -14,12 +19,27 @@ from .utils import (
     access_equalizer,
     get_data,
     set_data,
+    register_data,
+    unregister_data,
+    is_connected,
+    peek_data,
+    peek_queue,
+    player_stopped,
     access_data,
+    track_cache,
+    empty_track_cache,
+    inflight_track_loads,
+    decoded_track_cache,
+    queued_tracks,
+    decode_track,
+    interned_track_metas,
+    load_tracks,
+    normalize_query,
+    auto_search_tracks,
 )
 from .events import (
     InternalConnectionChangeEvent,
     ConnectionCommandsInvokedEvent,
     AutomaticConnectionChangeEvent,
-    TrackStoppedEvent,
 )
 from .impl import EventHandler
@@ -24,8 +24,3 @@ class ConnectionCommandsInvokedEvent(InternalConnectionChangeEvent):
 @a.frozen
 class AutomaticConnectionChangeEvent(InternalConnectionChangeEvent):
     pass
-
-
-@a.frozen
-class TrackStoppedEvent(BaseLyraEvent):
-    pass
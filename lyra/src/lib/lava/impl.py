@@ -1,12 +1,12 @@
-import asyncio
 import logging
 
 import hikari as hk
 import alluka as al
 import lavasnek_rs as lv
 
+from ..consts import HISTORY_MAX, HISTORY_SPILL_BATCH
 from ..extras import Panic, lgfmt
-from ..dataimpl import LyraDBClientType, LyraDBCollectionType
+from ..dataimpl import GuildConfigCache, UnplayableTracks, HistoryLog
 from ..errors import QueueEmptyError
 from ..utils import EmojiCache, get_client
 from ..playback import while_stop, skip
@@ -14,12 +14,13 @@ from .utils import (
     BaseEventHandler,
     RepeatMode,
     access_data,
+    decode_track,
+    is_connected,
+    peek_data,
     generate_nowplaying_embed,
     get_data,
     get_repeat_emoji,
-    wait_until_current_track_valid,
 )
-from .events import TrackStoppedEvent
 
 
 logger = logging.getLogger(lgfmt(__name__))
@@ -37,9 +38,9 @@ class EventHandler(BaseEventHandler):
         event: lv.TrackStart,
         /,
     ) -> None:
-        t = (await lvc.decode_track(event.track)).title
+        t = (await decode_track(lvc, event.track)).title
 
-        if not await lvc.get_guild_node(event.guild_id):
+        if not is_connected(event.guild_id):
             return
         async with access_data(event.guild_id, lvc) as d:
             q = d.queue
@@ -47,20 +48,30 @@ class EventHandler(BaseEventHandler):
             if q.is_stopped:
                 return
             q.update_curr_t_started()
+            d.player_active = True
             logger.debug(
                 f"In guild {event.guild_id} track [{q.pos: >3}/{l: >3}] started: '{t}'"
             )
 
             client = get_client()
 
-            cfg = client.get_type_dependency(LyraDBCollectionType)
+            cfg = client.get_type_dependency(GuildConfigCache)
             emj = client.get_type_dependency(EmojiCache)
+            hist = client.get_type_dependency(HistoryLog)
 
-            assert not isinstance(cfg, al.abc.Undefined) and not isinstance(
-                emj, al.abc.Undefined
+            assert (
+                not isinstance(cfg, al.abc.Undefined)
+                and not isinstance(emj, al.abc.Undefined)
+                and not isinstance(hist, al.abc.Undefined)
             )
 
-            g_cfg = cfg.find_one({'id': str(event.guild_id)})
+            if spill := q.trim_history(HISTORY_MAX, batch=HISTORY_SPILL_BATCH):
+                await hist.append(q.history_id, spill)
+                logger.debug(
+                    f"In guild {event.guild_id} spilled {len(spill)} played track(s)"
+                )
+
+            g_cfg = await cfg.find_one({'id': str(event.guild_id)})
             assert g_cfg
 
             if not g_cfg.setdefault('send_nowplaying_msg', False):
@@ -99,22 +110,30 @@ class EventHandler(BaseEventHandler):
             # await skip__(event.guild_id, lvc)
 
     async def track_finish(self, lvc: lv.Lavalink, event: lv.TrackFinish, /) -> None:
-        t = (await lvc.decode_track(event.track)).title
-        if not await lvc.get_guild_node(event.guild_id):
+        t = (await decode_track(lvc, event.track)).title
+        if not is_connected(event.guild_id):
             return
-        async with access_data(event.guild_id, lvc, strict=False) as d:
-            q = d.queue
-            l = len(q)
 
-            client = get_client()
+        client = get_client()
 
-            cfg = client.get_type_dependency(LyraDBCollectionType)
-            bot = client.get_type_dependency(hk.GatewayBot)
-            assert not isinstance(cfg, al.abc.Undefined) and not isinstance(
-                bot, al.abc.Undefined
+        cfg = client.get_type_dependency(GuildConfigCache)
+        assert not isinstance(cfg, al.abc.Undefined)
+
+        # Whoever stopped the player is holding the guild's turn while waiting for this,
+        # so it must be confirmed before queueing up behind them on the guild's actor
+        if stopped := (q := (d := peek_data(event.guild_id)).queue).is_stopped:
+            logger.info(
+                f"In guild {event.guild_id} track [{q.pos: >3}/{len(q): >3}] stopped: '{t}'"
             )
+        d.player_active = False
+        d.confirm_stop(event.track)
+        d.signal()
+
+        async with access_data(event.guild_id, lvc, strict=False) as d:
+            q = d.queue
+            l = len(q)
 
-            g_cfg = cfg.find_one({'id': str(event.guild_id)})
+            g_cfg = await cfg.find_one({'id': str(event.guild_id)})
             assert g_cfg
 
             if g_cfg.get('send_nowplaying_msg', False) and (msg := d.nowplaying_msg):
@@ -125,11 +144,7 @@ class EventHandler(BaseEventHandler):
                 finally:
                     d.nowplaying_msg = d.nowplaying_components = None
 
-            if q.is_stopped:
-                logger.info(
-                    f"In guild {event.guild_id} track [{q.pos: >3}/{l: >3}] stopped: '{t}'"
-                )
-                bot.dispatch(TrackStoppedEvent(bot))
+            if stopped:
                 return
             try:
                 if next_t := q.next:
@@ -150,7 +165,7 @@ class EventHandler(BaseEventHandler):
     async def track_exception(
         self, lvc: lv.Lavalink, event: lv.TrackException, /
     ) -> Panic[None]:
-        t_info = await lvc.decode_track(event.track)
+        t_info = await decode_track(lvc, event.track)
         d = await get_data(event.guild_id, lvc)
         l = len(d.queue)
 
@@ -168,15 +183,10 @@ class EventHandler(BaseEventHandler):
 
         client = get_client()
 
-        mgc = client.get_type_dependency(LyraDBClientType)
-        assert not isinstance(mgc, al.abc.Undefined)
-
-        upt = mgc.get_database(  # pyright: ignore [reportUnknownMemberType]
-            'internal'
-        ).get_collection('unplayable-tracks')
-        flt = {'identifier': t_info.identifier}
+        upt = client.get_type_dependency(UnplayableTracks)
+        assert not isinstance(upt, al.abc.Undefined)
 
-        if not await lvc.get_guild_node(event.guild_id):
+        if not is_connected(event.guild_id):
             return
         async with access_data(event.guild_id, lvc) as d:
             async with while_stop(event.guild_id, lvc, d):
@@ -186,13 +196,9 @@ class EventHandler(BaseEventHandler):
                     advance=False,
                     change_stop=False,
                 )
-            if d.queue.next:
-                f = asyncio.Task(wait_until_current_track_valid(event.guild_id, lvc))
-                await asyncio.wait_for(f, None)
 
-            d.queue.filter_sub(lambda t: t.track.info.identifier == t_info.identifier)
-            if not upt.find_one(flt):
-                upt.insert_one(flt)  # pyright: ignore [reportUnknownMemberType]
+            d.queue.filter_sub(lambda t: t.meta.identifier == t_info.identifier)
+            await upt.add(t_info.identifier)
 
             ch = d.out_channel_id
             msg = d.nowplaying_msg
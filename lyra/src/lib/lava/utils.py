@@ -1,4 +1,8 @@
 import abc
+import time
+import uuid
+import collections as cs
+import weakref as wr
 import enum as e
 import random as rd
 import typing as t
@@ -12,9 +16,21 @@ import hikari as hk
 import lavasnek_rs as lv
 
 from ..utils import MaybeGuildIDAware, IntCastable, infer_guild, limit_img_size_by_guild
-from ..consts import STOP_REFRESH
+from ..consts import (
+    TRACK_CACHE_SIZE,
+    TRACK_CACHE_TTL,
+    EMPTY_TRACK_CACHE_SIZE,
+    EMPTY_TRACK_CACHE_TTL,
+    DECODED_TRACK_CACHE_SIZE,
+    DECODED_TRACK_CACHE_TTL,
+)
 from ..extras import (
     List,
+    PredicateSig,
+    TTLCache,
+    SingleFlight,
+    FenwickTree,
+    TrigramIndex,
     Option,
     Fallible,
     Panic,
@@ -25,6 +41,7 @@ from ..extras import (
     split_preset,
     inj_glob,
     to_stamp,
+    url_regex,
 )
 from ..errors import QueueEmptyError, NotConnectedError
 
@@ -68,19 +85,321 @@ class RepeatMode(e.Enum):
 #         return QueuePosition(super().__add__(__x))
 
 
+@a.frozen
+class TrackMeta:
+    """
+    The immutable metadata of a track, shared by every queue entry of that track across every guild
+
+    A queued track's `lv.Track` is kept here as well, so that each track is held once however many queues it's in. The fields are still copied out of its info, as `lv.Track.info` clones the whole info object on every access
+    """
+
+    identifier: str
+    title: str
+    author: str
+    uri: str
+    length: int
+    track: Option[lv.Track] = a.field(default=None, eq=False, repr=False)
+
+    @classmethod
+    def of(cls, info: lv.Info, /, track: Option[lv.Track] = None):
+        meta = _track_metas.get(info.identifier)
+        if meta and (track is None or meta.track):
+            return meta
+        meta = _track_metas[info.identifier] = cls(
+            info.identifier, info.title, info.author, info.uri, info.length, track
+        )
+        return meta
+
+
+_track_metas: wr.WeakValueDictionary[str, TrackMeta] = wr.WeakValueDictionary()
+"""The intern table of track metadata by track identifiers, forgetting a track's metadata once no queue references it any more"""
+
+
+@a.frozen(eq=False)
+class QueueEntry:
+    """A slotted queue entry, which keeps the track's metadata at hand so that the queue never has to go through the track's info object, unlike `lv.TrackQueue`"""
+
+    requester: hk.Snowflakeish
+    meta: TrackMeta
+
+    @classmethod
+    def from_track(cls, track: lv.Track, requester: hk.Snowflakeish, /):
+        meta = TrackMeta.of(track.info, track)
+        assert meta.track
+        _queued_tracks[track.track] = _queued_tracks[meta.track.track] = meta
+        return cls(requester, meta)
+
+    @property
+    def track(self) -> lv.Track:
+        assert self.meta.track
+        return self.meta.track
+
+    @property
+    def length(self) -> int:
+        return self.meta.length
+
+    @property
+    def title(self) -> str:
+        return self.meta.title
+
+    @property
+    def author(self) -> str:
+        return self.meta.author
+
+    @property
+    def uri(self) -> str:
+        return self.meta.uri
+
+
+_queued_tracks: wr.WeakValueDictionary[str, TrackMeta] = wr.WeakValueDictionary()
+"""The metadata of every queued track by its encoded form, forgetting a track once no queue references its metadata any more"""
+
+
+def interned_track_metas() -> int:
+    return len(_track_metas)
+
+
+class QueueView(t.Sequence[QueueEntry]):
+    """A read-only window over a range of positions in a queue, which never copies the tracks it spans"""
+
+    __slots__ = ('_queue', '_range')
+
+    def __init__(self, queue: t.Sequence[QueueEntry], range_: range, /):
+        self._queue = queue
+        self._range = range_
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    @t.overload
+    def __getitem__(self, i: int, /) -> QueueEntry:
+        ...
+
+    @t.overload
+    def __getitem__(self, i: slice, /) -> 'QueueView':
+        ...
+
+    def __getitem__(self, i: int | slice, /) -> 'QueueEntry | QueueView':
+        if isinstance(i, slice):
+            return QueueView(self._queue, self._range[i])
+        return self._queue[self._range[i]]
+
+    def __iter__(self) -> t.Iterator[QueueEntry]:
+        return map(self._queue.__getitem__, self._range)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({[*self]!r})'
+
+
 @a.s(auto_attribs=False, auto_detect=True)
-class QueueList(List[lv.TrackQueue]):
+class QueueList(List[QueueEntry]):
     pos: int = 0
     repeat_mode: RepeatMode = RepeatMode.NONE
     is_paused: bool = a.field(factory=bool, kw_only=True)
     is_stopped: bool = a.field(factory=bool, kw_only=True)
     _paused_np_position: Option[int] = a.field(default=None, init=False)
     _curr_t_started: int = a.field(factory=curr_time_ms, init=False)
+    _lengths: list[int] = a.field(factory=list, init=False, eq=False, repr=False)
+    _total_durr: int = a.field(default=0, init=False, eq=False, repr=False)
+    _durrs: Option[FenwickTree] = a.field(
+        default=None, init=False, eq=False, repr=False
+    )
+    _titles: TrigramIndex[QueueEntry] = a.field(
+        factory=TrigramIndex, init=False, eq=False, repr=False
+    )
+    _identifiers: cs.Counter[str] = a.field(
+        factory=cs.Counter, init=False, eq=False, repr=False
+    )
+    _rng: rd.Random = a.field(factory=rd.Random, init=False, eq=False, repr=False)
+    _lazy_shuffled_until: Option[int] = a.field(
+        default=None, init=False, eq=False, repr=False
+    )
+    _lazy_shuffled_end: int = a.field(default=0, init=False, eq=False, repr=False)
+    history_id: str = a.field(
+        factory=lambda: uuid.uuid4().hex, init=False, eq=False, repr=False
+    )
+    spilled: int = a.field(default=0, init=False, eq=False, repr=False)
+    spilled_durr: int = a.field(default=0, init=False, eq=False, repr=False)
+
+    # Every list mutator keeps `_lengths`, `_total_durr`, `_titles`, `_identifiers` and the
+    # lazy shuffle's cursor in sync. Single tracks added, replaced or removed also update
+    # `_durrs` in place, while slice assignments and deletions drop it to be rebuilt lazily
+
+    def append(self, t_: QueueEntry, /) -> None:
+        super().append(t_)
+        self._add_lengths((t_.length,))
+        self._index((t_,))
+
+    def extend(self, ts: t.Iterable[QueueEntry], /) -> None:
+        ts = (*ts,)
+        super().extend(ts)
+        self._add_lengths(t_.length for t_ in ts)
+        self._index(ts)
+
+    def __iadd__(self, ts: t.Iterable[QueueEntry], /) -> 'QueueList':
+        self.extend(ts)
+        return self
+
+    def insert(self, i: t.SupportsIndex, t_: QueueEntry, /) -> None:
+        j = slice(i, None).indices(len(self))[0]
+        if (until := self._lazy_shuffled_until) is not None and (
+            until <= j < self._lazy_shuffled_end
+        ):
+            self.settle()
+        self._shift_lazy_cursor(j, 1)
+        super().insert(j, t_)
+        self._lengths.insert(j, durr := t_.length)
+        self._total_durr += durr
+        self._splice_durrs(j)
+        self._index((t_,))
+
+    def pop(self, i: t.SupportsIndex = -1, /) -> QueueEntry:
+        j = range(len(self))[i]
+        self._shift_lazy_cursor(j, -1)
+        t_ = super().pop(j)
+        self._total_durr -= self._lengths.pop(j)
+        self._splice_durrs(j)
+        self._unindex((t_,))
+        return t_
+
+    def remove(self, t_: QueueEntry, /) -> None:
+        del self[self.index(t_)]
+
+    def clear(self) -> None:
+        super().clear()
+        self._lengths.clear()
+        self._total_durr = 0
+        self._durrs = None
+        self._titles.clear()
+        self._identifiers.clear()
+
+    @t.overload
+    def __setitem__(self, i: t.SupportsIndex, t_: QueueEntry, /) -> None:
+        ...
+
+    @t.overload
+    def __setitem__(self, i: slice, ts: t.Iterable[QueueEntry], /) -> None:
+        ...
+
+    def __setitem__(self, i: t.Any, ts: t.Any, /) -> None:
+        if isinstance(i, slice):
+            ts = (*t.cast(t.Iterable[QueueEntry], ts),)
+            self._lazy_shuffled_until = None
+            self._unindex(super().__getitem__(i))
+            super().__setitem__(i, ts)
+            self._lengths[i] = (t_.length for t_ in ts)
+            self._total_durr = sum(self._lengths)
+            self._durrs = None
+            self._index(ts)
+            return
+
+        self._unindex((super().__getitem__(i),))
+        super().__setitem__(i, ts)
+        self._index((ts,))
+        i = range(len(self))[i]
+        delta = t.cast(QueueEntry, ts).length - self._lengths[i]
+        self._lengths[i] += delta
+        self._total_durr += delta
+        if self._durrs is not None:
+            self._durrs.add(i, delta)
+
+    def __delitem__(self, i: t.SupportsIndex | slice, /) -> None:
+        if isinstance(i, slice):
+            if (until := self._lazy_shuffled_until) is not None:
+                rm = range(len(self))[i]
+                self._lazy_shuffled_until -= sum(j < until for j in rm)
+                self._lazy_shuffled_end -= sum(j < self._lazy_shuffled_end for j in rm)
+            self._unindex(super().__getitem__(i))
+            super().__delitem__(i)
+            self._total_durr -= sum(self._lengths[i])
+            del self._lengths[i]
+            self._durrs = None
+        else:
+            j = range(len(self))[i]
+            self._shift_lazy_cursor(j, -1)
+            self._unindex((super().__getitem__(j),))
+            super().__delitem__(j)
+            self._total_durr -= self._lengths.pop(j)
+            self._splice_durrs(j)
+
+    def _index(self, ts: t.Iterable[QueueEntry], /) -> None:
+        for t_ in ts:
+            self._titles.add(t_, t_.title)
+            self._identifiers[t_.meta.identifier] += 1
+
+    def _unindex(self, ts: t.Iterable[QueueEntry], /) -> None:
+        identifiers = self._identifiers
+        for t_ in ts:
+            self._titles.discard(t_)
+            if (n := identifiers[i := t_.meta.identifier]) <= 1:
+                del identifiers[i]
+            else:
+                identifiers[i] = n - 1
+
+    def _shift_lazy_cursor(self, i: int, delta: int, /) -> None:
+        if (until := self._lazy_shuffled_until) is None:
+            return
+        if i < until:
+            self._lazy_shuffled_until = until + delta
+        if i < self._lazy_shuffled_end:
+            self._lazy_shuffled_end += delta
+
+    def has_track(self, identifier: str, /) -> bool:
+        return identifier in self._identifiers
+
+    def find_title(self, title: str, /) -> Option[int]:
+        """Finds the position of the track whose title best matches `title`, if any of them resemble it at all"""
+
+        if not (found := self._titles.search(title)):
+            return None
+        return self.index(found[0][0])
+
+    def _swap(self, i: int, j: int, /) -> None:
+        if i == j:
+            return
+        t_i, t_j = self[i], self[j]
+        super().__setitem__(i, t_j)
+        super().__setitem__(j, t_i)
+
+        lengths = self._lengths
+        lengths[i], lengths[j] = lengths[j], lengths[i]
+        if self._durrs is not None:
+            self._durrs.add(i, delta := lengths[i] - lengths[j])
+            self._durrs.add(j, -delta)
+
+    def _add_lengths(self, lengths: t.Iterable[int], /) -> None:
+        for durr in lengths:
+            self._lengths.append(durr)
+            self._total_durr += durr
+            if self._durrs is not None:
+                self._durrs.append(durr)
+
+    def _splice_durrs(self, i: int, /) -> None:
+        if self._durrs is not None:
+            self._durrs.splice(i, self._lengths[i:])
+
+    @property
+    def _timeline(self) -> FenwickTree:
+        if self._durrs is None:
+            self._durrs = FenwickTree(self._lengths)
+        return self._durrs
+
+    def durr_until(self, i: int, /) -> int:
+        """The total duration of every track before the `i`-th one"""
+
+        return self._timeline.prefix_sum(i)
+
+    def index_at(self, offset_ms: int, /) -> Option[int]:
+        """Finds the position of the track that would be playing `offset_ms` into the queue, if the queue is long enough"""
+
+        if not (0 <= offset_ms < self._total_durr):
+            return None
+        self.settle()
+        return self._timeline.search(offset_ms)
 
     def __repr__(self) -> str:
         return "[\n\t%s\n]" % '\n\t'.join(
-            f'{i} {t.track.info.title}{" <<" if i == self.pos else ""}'
-            for i, t in enumerate(self)
+            f'{i} {t.title}{" <<" if i == self.pos else ""}' for i, t in enumerate(self)
         )
 
     @property
@@ -93,7 +412,7 @@ class QueueList(List[lv.TrackQueue]):
         return curr_time_ms() - self._curr_t_started
 
     @property
-    def current(self) -> Fallible[Option[lv.TrackQueue]]:
+    def current(self) -> Fallible[Option[QueueEntry]]:
         if not self:
             raise QueueEmptyError
 
@@ -110,28 +429,106 @@ class QueueList(List[lv.TrackQueue]):
 
     @property
     def total_durr(self) -> int:
-        return sum(t.track.info.length for t in self)
+        return self._total_durr
+
+    @property
+    def history_durr(self) -> int:
+        return self.durr_until(self.pos)
 
     @property
     def is_playing(self) -> Fallible[bool]:
         return not (self.is_paused or self.is_stopped) and bool(self.current)
 
     @property
-    def upcoming(self) -> Fallible[list[lv.TrackQueue]]:
+    def upcoming(self) -> Fallible[QueueView]:
         if not self:
             raise QueueEmptyError
 
-        return self[self.pos + 1 :]
+        return QueueView(self, range(len(self))[self.pos + 1 :])
 
     @property
-    def history(self) -> Fallible[list[lv.TrackQueue]]:
+    def history(self) -> Fallible[QueueView]:
         if not self:
             raise QueueEmptyError
 
-        return self[: self.pos]
+        return QueueView(self, range(len(self))[: self.pos])
+
+    def remove_at(self, i: int, /) -> QueueEntry:
+        self.settle()
+        return self.pop(i)
+
+    def remove_range(self, start: int, stop: int, /) -> list[QueueEntry]:
+        self.settle()
+        rm = self[start:stop]
+        del self[start:stop]
+        return rm
+
+    def filter_sub(self, predicate: Option[PredicateSig[QueueEntry]] = None):
+        """Removes every track matching `predicate` in a single pass, shifting `pos` back by how many of them came before it"""
+
+        self.settle()
+        kept: list[QueueEntry] = []
+        shift = 0
+        for i, t_ in enumerate(self):
+            if predicate is None or predicate(t_):
+                shift += i < self.pos
+            else:
+                kept.append(t_)
+        self[:] = kept
+        self.pos -= shift
+
+    def trim_history(self, keep: int, /, *, batch: int = 1) -> list[QueueEntry]:
+        """Removes and returns the played tracks older than the latest `keep` of them so that they can be spilled, once there are at least `batch` of them, unless the queue is repeating, in which case every played track is still to come around again"""
+
+        excess = self.pos - keep
+        if self.repeat_mode is not RepeatMode.NONE or excess < max(batch, 1):
+            return []
+
+        spill = [*self[:excess]]
+        del self[:excess]
+        self.pos -= excess
+        self.spilled += excess
+        self.spilled_durr += sum(t_.length for t_ in spill)
+        return spill
+
+    def restore_history(self, t_: QueueEntry, /) -> None:
+        """Puts a played track that was spilled back in front of the queue's history"""
+
+        self.insert(0, t_)
+        self.pos += 1
+
+    def remove_duplicates(self) -> int:
+        """Removes every repeat of a track in a single pass, keeping its first occurrence, or the current track over any other occurrence of it. Returns how many tracks were removed"""
+
+        if len(self._identifiers) == len(self):
+            return 0
+
+        curr = self[self.pos] if self.pos < len(self) else None
+        seen = {curr.meta.identifier} if curr else set[str]()
+
+        def repeated(t_: QueueEntry) -> bool:
+            if t_ is curr:
+                return False
+            if (i := t_.meta.identifier) in seen:
+                return True
+            seen.add(i)
+            return False
+
+        n = len(self)
+        self.filter_sub(repeated)
+        return n - len(self)
+
+    def move(self, src: int, dst: int, /) -> None:
+        self.settle()
+        self.insert(dst, self.pop(src))
+
+    def swap(self, i: int, j: int, /) -> None:
+        self.settle()
+        self._swap(i, j)
 
     def adv(self) -> None:
         self.pos += 1
+        self._draw(self.pos + 1)
 
     def wrap(self) -> None:
         self.pos %= len(self)
@@ -140,7 +537,7 @@ class QueueList(List[lv.TrackQueue]):
         self.pos -= 1
 
     @property
-    def next(self) -> Fallible[Option[lv.TrackQueue]]:
+    def next(self) -> Fallible[Option[QueueEntry]]:
         if not self:
             raise QueueEmptyError
 
@@ -161,21 +558,53 @@ class QueueList(List[lv.TrackQueue]):
 
         return self[pos]
 
-    def shuffle(self) -> Fallible[None]:
+    def shuffle(
+        self, *, seed: Option[int] = None, lazy: bool = False
+    ) -> Fallible[None]:
+        """Shuffles the upcoming tracks in place. A lazy shuffle instead draws each upcoming track at random only once the track before it starts playing, so that large queues don't have to be shuffled all at once. Only the tracks queued at the time are drawn from, and anything that depends on the order of the tracks not drawn yet settles the shuffle first"""
+
         if not self:
             raise QueueEmptyError
 
-        upcoming = self.upcoming
-        rd.shuffle(upcoming)
-        hist = self[: self.pos + 1]
-        self.clear()
-        self.extend(hist + upcoming)
+        if seed is not None:
+            self._rng.seed(seed)
+        start = self.pos + 1
+        if lazy:
+            self._lazy_shuffled_until = start
+            self._lazy_shuffled_end = len(self)
+            self._draw(start)
+            return
+
+        self._lazy_shuffled_until = None
+        for i in range(len(self) - 1, start, -1):
+            self._swap(i, self._rng.randint(start, i))
+
+    def _draw(self, i: int, /) -> None:
+        """Draws every lazily shuffled track up to and including the `i`-th one"""
+
+        if (until := self._lazy_shuffled_until) is None:
+            return
+
+        end = self._lazy_shuffled_end
+        while until <= i and until < end:
+            self._swap(until, self._rng.randrange(until, end))
+            until += 1
+        self._lazy_shuffled_until = None if until >= end else until
+
+    def settle(self) -> None:
+        """Draws every track of a pending lazy shuffle, so that the order of the upcoming tracks is final"""
+
+        self._draw(self._lazy_shuffled_end - 1)
 
     def set_repeat(self, mode: RepeatMode) -> None:
         self.repeat_mode = mode
 
     def clr(self) -> None:
         self.clear()
+        self._lazy_shuffled_until = None
+        self.history_id = uuid.uuid4().hex
+        self.spilled = 0
+        self.spilled_durr = 0
         self.reset_repeat()
         self.pos = 0
 
@@ -286,9 +715,93 @@ class Equalizer(object):
         self.volume -= amount
 
 
+@a.define(eq=False)
+class GuildActor:
+    """
+    Serializes everything that touches a guild's session data, whether it comes from a command, a button press or a Lavalink event
+
+    Every caller posts to the actor's mailbox, and the actor's own task grants the guild to each of them in turn, in the order they arrived. The actors of different guilds never wait on each other, and a task that already holds the guild's turn passes straight through, while the tasks it spawns wait for their own turn like any other caller
+    """
+
+    _mailbox: asyncio.Queue[tuple[asyncio.Future[None], asyncio.Event, float]] = (
+        a.field(factory=asyncio.Queue, init=False)
+    )
+    _task: Option[asyncio.Task[None]] = a.field(default=None, init=False)
+    _holder: Option[asyncio.Task[t.Any]] = a.field(default=None, init=False)
+    _closed: bool = a.field(default=False, init=False)
+    processed: int = a.field(default=0, init=False)
+    max_wait: float = a.field(default=0.0, init=False)
+    _total_wait: float = a.field(default=0.0, init=False)
+    _total_hold: float = a.field(default=0.0, init=False)
+
+    @property
+    def depth(self) -> int:
+        return self._mailbox.qsize()
+
+    @property
+    def mean_wait(self) -> float:
+        return self._total_wait / (self.processed or 1)
+
+    @property
+    def mean_hold(self) -> float:
+        return self._total_hold / (self.processed or 1)
+
+    @ctxlib.asynccontextmanager
+    async def turn(self):
+        if (task := asyncio.current_task()) is not None and task is self._holder:
+            yield
+            return
+
+        if self._closed:
+            raise NotConnectedError
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        granted: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        released = asyncio.Event()
+        self._mailbox.put_nowait((granted, released, time.perf_counter()))
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                released.set()
+            raise
+
+        self._holder = task
+        try:
+            yield
+        finally:
+            self._holder = None
+            released.set()
+
+    async def _run(self) -> None:
+        while True:
+            granted, released, queued_at = await self._mailbox.get()
+            if granted.done():
+                continue
+
+            granted.set_result(None)
+            started = time.perf_counter()
+            await released.wait()
+
+            self.processed += 1
+            self._total_wait += (wait := started - queued_at)
+            self._total_hold += time.perf_counter() - started
+            self.max_wait = max(self.max_wait, wait)
+
+    def close(self) -> None:
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+        while not self._mailbox.empty():
+            granted, _, _ = self._mailbox.get_nowait()
+            if not granted.done():
+                granted.set_exception(NotConnectedError())
+
+
 @a.define
 class NodeData:
     queue: QueueList = a.field(factory=QueueList, init=False)
+    actor: GuildActor = a.field(factory=GuildActor, init=False)
     equalizer: Equalizer = a.field(factory=Equalizer, init=False)
     out_channel_id: Option[hk.Snowflakeish] = a.field(default=None, init=False)
 
@@ -296,8 +809,55 @@ class NodeData:
     nowplaying_components: Option[t.Sequence[hk.api.ActionRowBuilder]] = a.field(
         default=None, init=False
     )
+    player_active: bool = a.field(default=False, init=False)
+    _stopping: dict[str, asyncio.Future[None]] = a.field(factory=dict, init=False)
+    _changed: asyncio.Event = a.field(factory=asyncio.Event, init=False)
     ...
 
+    def signal(self) -> None:
+        """Wakes up everything waiting on this guild's state to change"""
+
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_until(
+        self,
+        predicate: PredicateSig['NodeData'],
+        /,
+        *,
+        timeout: Option[float] = None,
+    ) -> bool:
+        """Waits until `predicate` holds for this guild's state, checking it again only whenever the state is signalled to have changed. Returns whether it held before timing out"""
+
+        async def wait():
+            while not predicate(self):
+                await self._changed.wait()
+
+        try:
+            await asyncio.wait_for(wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def expect_stop(self, track: str, /) -> asyncio.Future[None]:
+        """Returns a future resolved once the player has actually stopped playing `track`, the encoded track that's about to be stopped"""
+
+        if (fut := self._stopping.get(track)) is None or fut.done():
+            fut = self._stopping[track] = asyncio.get_running_loop().create_future()
+        return fut
+
+    def confirm_stop(self, track: str, /) -> None:
+        if (fut := self._stopping.pop(track, None)) and not fut.done():
+            fut.set_result(None)
+
+    def forget_stop(self, stopped: asyncio.Future[None], /) -> None:
+        """Drops `stopped`, a future from `expect_stop`, once no one is waiting on it anymore"""
+
+        for track, fut in [*self._stopping.items()]:
+            if fut is stopped:
+                del self._stopping[track]
+        stopped.cancel()
+
     async def edit_now_playing_components(
         self,
         rest: hk.api.RESTClient,
@@ -309,7 +869,15 @@ class NodeData:
             await rest.edit_message(self.out_channel_id, _np_msg, components=components)
 
 
-NodeDataRef = t.NewType('NodeDataRef', dict[int, NodeData])
+class NodeDataRef(dict[int, NodeData]):
+    """
+    The in-process registry of every connected guild's session data, keyed by guild ID
+
+    Sessions are registered when the bot connects and dropped when it disconnects, so looking one up is a plain dict lookup that never has to go through Lavalink
+    """
+
+
+sessions: t.Final = NodeDataRef()
 
 
 class BaseEventHandler(abc.ABC):
@@ -335,14 +903,112 @@ class BaseEventHandler(abc.ABC):
         ...
 
 
-async def get_data(guild: hk.Snowflakeish, lvc: lv.Lavalink, /) -> Panic[NodeData]:
+track_cache: TTLCache[str, lv.Tracks] = TTLCache(TRACK_CACHE_SIZE, TRACK_CACHE_TTL)
+empty_track_cache: TTLCache[str, lv.Tracks] = TTLCache(
+    EMPTY_TRACK_CACHE_SIZE, EMPTY_TRACK_CACHE_TTL
+)
+inflight_track_loads: SingleFlight[str, lv.Tracks] = SingleFlight()
+decoded_track_cache: TTLCache[str, TrackMeta] = TTLCache(
+    DECODED_TRACK_CACHE_SIZE, DECODED_TRACK_CACHE_TTL
+)
+
+
+def queued_tracks() -> int:
+    return len(_queued_tracks)
+
+
+async def decode_track(lvc: lv.Lavalink, track: str, /) -> TrackMeta:
+    """Decodes an encoded track into its metadata, only going through Lavalink for the tracks the bot didn't queue itself"""
+
+    if meta := _queued_tracks.get(track):
+        return meta
+    if meta := decoded_track_cache.get(track):
+        return meta
+
+    meta = decoded_track_cache[track] = TrackMeta.of(await lvc.decode_track(track))
+    return meta
+
+
+def normalize_query(query: str, /) -> str:
+    """Normalizes a Lavalink load query into its cache key, keeping its source prefix (`ytsearch:`, `scsearch:`, ...) and leaving direct URLs untouched"""
+
+    query = query.strip()
+    if url_regex.fullmatch(query):
+        return query
+    source, sep, terms = query.partition('search:')
+    if sep and source.isalpha():
+        return f"{source.lower()}search:{' '.join(terms.split()).casefold()}"
+    return ' '.join(query.split()).casefold()
+
+
+async def load_tracks(lvc: lv.Lavalink, query: str, /) -> lv.Tracks:
+    """A cached `lvc.get_tracks`, shared across every guild. Concurrent loads of the same query share a single request to Lavalink"""
+
+    key = normalize_query(query)
+    if (loaded := track_cache.get(key)) is not None:
+        return loaded
+    if (loaded := empty_track_cache.get(key)) is not None:
+        return loaded
+
+    async def load():
+        loaded = await lvc.get_tracks(query)
+        if loaded.tracks:
+            track_cache[key] = loaded
+        else:
+            empty_track_cache[key] = loaded
+        return loaded
+
+    return await inflight_track_loads.run(key, load)
+
+
+async def auto_search_tracks(lvc: lv.Lavalink, query: str, /) -> lv.Tracks:
+    """A cached `lvc.auto_search_tracks`, loading URLs directly and searching YouTube for anything else"""
+
+    return await load_tracks(
+        lvc, query if url_regex.fullmatch(query) else 'ytsearch:%s' % query
+    )
+
+
+async def register_data(guild: hk.Snowflakeish, lvc: lv.Lavalink, /) -> Panic[NodeData]:
+    """Registers the session data of a guild the bot has just connected in, keeping the existing data if the bot only moved channels"""
+
+    if (data := sessions.get(guild)) is not None:
+        return data
+
     node = await lvc.get_guild_node(guild)
     if not node:
         raise NotConnectedError
-    data = t.cast(NodeData, node.get_data() or NodeData())
+    data = sessions[guild] = t.cast(NodeData, node.get_data() or NodeData())
     return data
 
 
+def unregister_data(guild: hk.Snowflakeish, /) -> Option[NodeData]:
+    if (data := sessions.pop(guild, None)) is not None:
+        data.actor.close()
+        data.signal()
+    return data
+
+
+def is_connected(guild: hk.Snowflakeish, /) -> bool:
+    return guild in sessions
+
+
+def peek_data(g_: IntCastable | MaybeGuildIDAware, /) -> Panic[NodeData]:
+    """Looks up a guild's session data synchronously, for reads that don't need to write anything back"""
+
+    if (data := sessions.get(infer_guild(g_))) is None:
+        raise NotConnectedError
+    return data
+
+
+def peek_queue(g_: IntCastable | MaybeGuildIDAware, /) -> Panic[QueueList]:
+    return peek_data(g_).queue
+
+
+async def get_data(guild: hk.Snowflakeish, lvc: lv.Lavalink, /) -> Panic[NodeData]:
+    return peek_data(guild)
+
+
 async def set_data(
     guild: hk.Snowflakeish,
     lvc: lv.Lavalink,
@@ -351,55 +1017,54 @@ async def set_data(
     *,
     strict: bool = False,
 ) -> Panic[None]:
-    node = await lvc.get_guild_node(guild)
-    if not node:
+    if guild not in sessions:
         if strict:
             raise NotConnectedError
         return
-    try:
-        node.set_data(data)
-    except NotConnectedError:
-        if strict:
-            raise
+    sessions[guild] = data
+    data.signal()
 
 
 @ctxlib.asynccontextmanager
 async def access_queue(
     g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, /, *, strict: bool = True
 ):
-    data = await get_data(g := infer_guild(g_), lvc)
-    try:
-        yield data.queue
-    finally:
-        await set_data(g, lvc, data, strict=strict)
+    data = peek_data(g := infer_guild(g_))
+    async with data.actor.turn():
+        try:
+            yield data.queue
+        finally:
+            await set_data(g, lvc, data, strict=strict)
 
 
 @ctxlib.asynccontextmanager
 async def access_equalizer(
     g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, /, *, strict: bool = True
 ):
-    data = await get_data(g := infer_guild(g_), lvc)
-    try:
-        yield data.equalizer
-    finally:
-        await set_data(g, lvc, data, strict=strict)
+    data = peek_data(g := infer_guild(g_))
+    async with data.actor.turn():
+        try:
+            yield data.equalizer
+        finally:
+            await set_data(g, lvc, data, strict=strict)
 
 
 @ctxlib.asynccontextmanager
 async def access_data(
     g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, /, *, strict: bool = True
 ):
-    data = await get_data(g := infer_guild(g_), lvc)
-    try:
-        yield data
-    finally:
-        await set_data(g, lvc, data, strict=strict)
+    data = peek_data(g := infer_guild(g_))
+    async with data.actor.turn():
+        try:
+            yield data
+        finally:
+            await set_data(g, lvc, data, strict=strict)
 
 
 async def get_queue(
     g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, /
 ) -> Panic[QueueList]:
-    return (await get_data(infer_guild(g_), lvc)).queue
+    return peek_queue(g_)
 
 
 def get_repeat_emoji(q: QueueList, /):
@@ -419,12 +1084,11 @@ async def generate_nowplaying_embed(
     curr_t = q.current
     assert curr_t
 
-    t_info = curr_t.track.info
     req = cache.get_member(guild_id, curr_t.requester)
     # print(curr_t.requester)
     assert req, "That member has left the guild"
 
-    song_len = to_stamp(t_info.length)
+    song_len = to_stamp(curr_t.length)
     # np_pos = q.np_position // 1_000
     # now = int(time.time())
 
@@ -432,9 +1096,9 @@ async def generate_nowplaying_embed(
         thumb = limit_img_size_by_guild(thumb, guild_id, cache)
     embed = (
         hk.Embed(
-            title=f"🎧 __**`#{q.pos + 1}`**__  {t_info.title}",
-            description=f'👤 **{t_info.author}** ({song_len})',
-            url=t_info.uri,
+            title=f"🎧 __**`#{q.pos + 1}`**__  {curr_t.title}",
+            description=f'👤 **{curr_t.author}** ({song_len})',
+            url=curr_t.uri,
             color=q.curr_t_palette[0],
             timestamp=dt.datetime.now().astimezone(),
         )
@@ -448,11 +1112,5 @@ async def generate_nowplaying_embed(
     return embed
 
 
-async def wait_until_current_track_valid(
-    g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, /
-):
-    while True:
-        d = await get_data(infer_guild(g_), lvc)
-        if d.queue.current and d.out_channel_id:
-            return
-        await asyncio.sleep(STOP_REFRESH)
+def player_stopped(d: NodeData, /) -> bool:
+    return not d.player_active
@@ -1,8 +1,10 @@
+import copy
 import typing as t
 import itertools as it
 
 import hikari as hk
 import tanjun as tj
+import attr as a
 import alluka as al
 import lavasnek_rs as lv
 
@@ -35,7 +37,8 @@ from .utils import (
     cl,
 )
 from .cmd import get_full_cmd_repr
-from .lava import RepeatMode, access_data, get_queue
+from .dataimpl import HistoryLog
+from .lava import QueueList, RepeatMode, access_data, access_queue, get_queue
 
 
 music_h = tj.AnyHooks()
@@ -147,7 +150,7 @@ async def start_listeners_voting(
     )
 
     np = (await get_queue(ctx, lvc)).current
-    np_timeout = TIMEOUT if not np else np.track.info.length // 1_000
+    np_timeout = TIMEOUT if not np else np.length // 1_000
 
     with bot.stream(hk.InteractionCreateEvent, timeout=min(TIMEOUT, np_timeout)).filter(
         lambda e: isinstance(e.interaction, hk.ComponentInteraction)
@@ -183,40 +186,13 @@ async def start_listeners_voting(
         raise VotingTimeoutError
 
 
-async def generate_queue_embeds(
-    ctx: tj.abc.Context, lvc: lv.Lavalink, /
-) -> it.chain[hk.Embed]:
-    assert not ((ctx.guild_id is None) or (ctx.cache is None))
-    q = await get_queue(ctx, lvc)
-    _empty = cl(f"{'---':^63}", fore=Fore.D)
-
-    if np := q.current:
-        np_info = np.track.info
-        req = ctx.cache.get_member(ctx.guild_id, np.requester)
-        assert req is not None
-        np_text = ''.join(
-            (
-                ANSI_BLOCK
-                % "{} {} {} {}".format(
-                    cl(f"{q.pos+1: >2}.", fore=Fore.M),
-                    cl(f"{to_stamp(np_info.length):>6}", fore=Fore.W),
-                    cl('|', fore=Fore.D),
-                    cl(f"{wr(np_info.title, 50)}", style=Style.B, fore=Fore.M),
-                ),
-                f"📨 {req.mention}",
-            )
-        )
-    else:
-        np_text = ANSI_BLOCK % _empty
+def queue_base_embed(q: QueueList, /) -> hk.Embed:
+    """The embed every page of the queue listing is built on, with the queue's repeat mode and its progress"""
 
-    queue_durr = q.total_durr
-    queue_elapsed = sum(t.track.info.length for t in q.history) + (q.np_time or 0)
+    queue_durr = q.spilled_durr + q.total_durr
+    queue_elapsed = q.spilled_durr + q.history_durr + (q.np_time or 0)
     queue_eta = queue_durr - queue_elapsed
 
-    q = await get_queue(ctx, lvc)
-    prev = None if not (his := q.history) else his[-1]
-    upcoming = q.upcoming
-
     desc = (
         ""
         if q.repeat_mode is RepeatMode.NONE
@@ -238,11 +214,43 @@ async def generate_queue_embeds(
 
     color = q.curr_t_palette[2] if q.is_playing else None
 
-    _base_embed = hk.Embed(title="≡♪ Queue", description=desc, color=color,).set_footer(
+    return hk.Embed(title="≡♪ Queue", description=desc, color=color,).set_footer(
         f"⌛ {to_stamp(queue_elapsed)} (-{to_stamp(queue_eta)}) / {to_stamp(queue_durr)}ㅤ•ㅤ{q.sane_pos+1} (-{len(q)-q.sane_pos-1}) / {len(q)}"
     )
 
-    import copy
+
+async def generate_queue_embeds(
+    ctx: tj.abc.Context, lvc: lv.Lavalink, /
+) -> it.chain[hk.Embed]:
+    assert not ((ctx.guild_id is None) or (ctx.cache is None))
+    q = await get_queue(ctx, lvc)
+    _empty = cl(f"{'---':^63}", fore=Fore.D)
+
+    if np := q.current:
+        req = ctx.cache.get_member(ctx.guild_id, np.requester)
+        assert req is not None
+        np_text = ''.join(
+            (
+                ANSI_BLOCK
+                % "{} {} {} {}".format(
+                    cl(f"{q.pos+1: >2}.", fore=Fore.M),
+                    cl(f"{to_stamp(np.length):>6}", fore=Fore.W),
+                    cl('|', fore=Fore.D),
+                    cl(f"{wr(np.title, 50)}", style=Style.B, fore=Fore.M),
+                ),
+                f"📨 {req.mention}",
+            )
+        )
+    else:
+        np_text = ANSI_BLOCK % _empty
+
+    q = await get_queue(ctx, lvc)
+    q.settle()
+    # Copied, so that the rows stay consistent even if the queue changes while rendering
+    his = [*q.history]
+    prev = his[-1] if his else None
+    upcoming = [*q.upcoming]
+    _base_embed = queue_base_embed(q)
 
     np_embed = (
         copy.deepcopy(_base_embed)
@@ -253,7 +261,7 @@ async def generate_queue_embeds(
                 "{} {}".format(
                     cl(f"{q.pos: >2}.", fore=Fore.W),
                     cl(
-                        f"{to_stamp(prev.track.info.length):>6} | {wr(prev.track.info.title, 50)}",
+                        f"{to_stamp(prev.length):>6} | {wr(prev.title, 50)}",
                         fore=Fore.D,
                     ),
                 )
@@ -272,9 +280,9 @@ async def generate_queue_embeds(
                 "\n".join(
                     "{} {} {} {}".format(
                         cl(f"{j: >2}.", fore=Fore.B),
-                        cl(f"{to_stamp(t_.track.info.length):>6}"),
+                        cl(f"{to_stamp(t_.length):>6}"),
                         cl('|', fore=Fore.D),
-                        cl(f"{wr(t_.track.info.title, 50)}", fore=Fore.B),
+                        cl(f"{wr(t_.title, 50)}", fore=Fore.B),
                     )
                     for j, t_ in enumerate(upcoming[:Q_CHUNK], q.pos + 2)
                 )
@@ -291,7 +299,7 @@ async def generate_queue_embeds(
                 "{} {}".format(
                     cl(f"{j: >2}.", fore=Fore.W),
                     cl(
-                        f"{to_stamp(t_.track.info.length):>6} | {wr(t_.track.info.title, 50)}",
+                        f"{to_stamp(t_.length):>6} | {wr(t_.title, 50)}",
                         fore=Fore.D,
                     ),
                 )
@@ -314,9 +322,9 @@ async def generate_queue_embeds(
             % "\n".join(
                 "{} {} {} {}".format(
                     cl(f"{j: >2}.", fore=Fore.B),
-                    cl(f"{to_stamp(t_.track.info.length):>6}"),
+                    cl(f"{to_stamp(t_.length):>6}"),
                     cl('|', fore=Fore.D),
-                    cl(f"{wr(t_.track.info.title, 50)}", fore=Fore.B),
+                    cl(f"{wr(t_.title, 50)}", fore=Fore.B),
                 )
                 for j, t_ in enumerate(next_slice, q.pos + 2 + i * Q_CHUNK)
             ),
@@ -326,3 +334,79 @@ async def generate_queue_embeds(
     )
 
     return it.chain(prev_embeds, (np_embed,), next_embeds)
+
+
+@a.define
+class SpilledQueuePages:
+    """
+    Pages through the played tracks spilled out of a queue, older and older, fetching each page from the history log only once it's browsed to
+
+    Once the log runs out before the queue's count of spilled tracks does, the rest have expired, and the queue's count and duration of them are brought back in line
+    """
+
+    history_id: str
+    spilled: int
+    spilled_durr: int
+    shown: int = a.field(default=0, init=False)
+    shown_durr: int = a.field(default=0, init=False)
+    _before: t.Any = a.field(default=None, init=False)
+
+    @classmethod
+    def of(cls, q: QueueList, /):
+        return cls(q.history_id, q.spilled, q.spilled_durr)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.shown >= self.spilled
+
+    @property
+    def pages_left(self) -> int:
+        return -(-(self.spilled - self.shown) // Q_CHUNK)
+
+    async def fetch(
+        self, ctx: tj.abc.Context, lvc: lv.Lavalink, base: hk.Embed, /
+    ) -> Option[hk.Embed]:
+        if self.exhausted:
+            return None
+
+        hist = ctx.get_type_dependency(HistoryLog)
+        assert not isinstance(hist, al.abc.Undefined)
+
+        recs = await hist.page(self.history_id, limit=Q_CHUNK, before=self._before)
+        if len(recs) < min(Q_CHUNK, self.spilled - self.shown):
+            await self._expire(ctx, lvc, recs)
+        if not recs:
+            return None
+
+        self._before = recs[-1]['_id']
+        self.shown += len(recs)
+        self.shown_durr += sum(r['length'] for r in recs)
+        return copy.deepcopy(base).add_field(
+            f"Previous (older, {self.spilled} in total)",
+            ANSI_BLOCK
+            % "\n".join(
+                "{} {}".format(
+                    cl(f"{j: >3}.", fore=Fore.W),
+                    cl(
+                        f"{to_stamp(r['length']):>6} | {wr(r['title'], 50)}",
+                        fore=Fore.D,
+                    ),
+                )
+                for j, r in enumerate(reversed(recs), -self.shown)
+            ),
+        )
+
+    async def _expire(
+        self, ctx: tj.abc.Context, lvc: lv.Lavalink, recs: list[t.Any], /
+    ) -> None:
+        left = self.shown + len(recs)
+        expired = self.spilled - left
+        expired_durr = (
+            self.spilled_durr - self.shown_durr - sum(r['length'] for r in recs)
+        )
+        self.spilled = left
+        async with access_queue(ctx, lvc) as q:
+            if q.history_id != self.history_id:
+                return
+            q.spilled = max(0, q.spilled - expired)
+            q.spilled_durr = max(0, q.spilled_durr - expired_durr)
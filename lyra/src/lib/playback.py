@@ -7,6 +7,7 @@ import alluka as al
 import lavasnek_rs as lv
 
 from .consts import TIMEOUT
+from .dataimpl import HistoryLog
 from .extras import Option, Fallible, Panic, MapSig, PredicateSig
 from .errors import (
     Argument,
@@ -30,9 +31,11 @@ from .utils import (
     say,
 )
 from .lava import (
-    TrackStoppedEvent,
     NodeData,
+    QueueEntry,
     RepeatMode,
+    player_stopped,
+    load_tracks,
     access_data,
     access_queue,
     set_data,
@@ -54,12 +57,21 @@ async def stop(g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, /) -> None
 
 async def stop_in_ctxmng(
     g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, data: NodeData, /
-) -> None:
+) -> Option[asyncio.Future[None]]:
     g = infer_guild(g_)
 
-    data.queue.is_stopped = True
+    q = data.queue
+    # Only a player that is still playing a track will send a `TrackFinish` for it. Once the
+    # track has already ended or failed, waiting falls back to the player being inactive
+    stopped = (
+        data.expect_stop(curr.track.track)
+        if data.player_active and q and not q.is_stopped and (curr := q.current)
+        else None
+    )
+    q.is_stopped = True
     await set_data(g, lvc, data)
     await lvc.stop(g)
+    return stopped
 
 
 async def unstop(ctx: tj.abc.Context, lvc: lv.Lavalink, /) -> None:
@@ -68,23 +80,22 @@ async def unstop(ctx: tj.abc.Context, lvc: lv.Lavalink, /) -> None:
         q.is_stopped = False
 
 
-async def wait_for_track_finish_event_fire():
-    client = get_client()
-    bot = client.get_type_dependency(hk.GatewayBot)
-    assert not isinstance(bot, al.abc.Undefined)
+async def wait_until_stopped(data: NodeData, stopped: Option[asyncio.Future[None]], /):
+    if stopped is None:
+        await data.wait_until(player_stopped, timeout=TIMEOUT)
+        return
 
     try:
-        await bot.wait_for(TrackStoppedEvent, timeout=TIMEOUT)
+        await asyncio.wait_for(asyncio.shield(stopped), timeout=TIMEOUT)
     except asyncio.TimeoutError:
-        return
+        data.forget_stop(stopped)
 
 
 @ctxlib.asynccontextmanager
 async def while_stop(
     g_: IntCastable | MaybeGuildIDAware, lvc: lv.Lavalink, data: NodeData, /
 ):
-    await stop_in_ctxmng(g_, lvc, data)
-    await wait_for_track_finish_event_fire()
+    await wait_until_stopped(data, await stop_in_ctxmng(g_, lvc, data))
     try:
         yield
     finally:
@@ -188,7 +199,7 @@ async def skip(
     advance: bool = True,
     reset_repeat: bool = False,
     change_stop: bool = True,
-) -> Option[lv.TrackQueue]:
+) -> Option[QueueEntry]:
     async with access_queue(g_, lvc) as q:
         skip = q.current
         if reset_repeat:
@@ -209,7 +220,7 @@ async def skip_abs(ctx_: ContextishType, lvc: lv.Lavalink):
     skip_t = await skip(ctx_, lvc, reset_repeat=True)
 
     assert skip_t is not None
-    await say(ctx_, show_author=True, content=f"⏭️ ~~`{skip_t.track.info.title}`~~")
+    await say(ctx_, show_author=True, content=f"⏭️ ~~`{skip_t.title}`~~")
 
 
 async def back(
@@ -219,7 +230,7 @@ async def back(
     *,
     advance: bool = True,
     reset_repeat: bool = False,
-) -> lv.TrackQueue:
+) -> QueueEntry:
     async with access_data(ctx_, lvc) as d:
         q = d.queue
         i = q.pos
@@ -247,15 +258,40 @@ async def back(
     return prev
 
 
+async def restore_spilled_history(ctx_: ContextishType, lvc: lv.Lavalink, /) -> bool:
+    """Brings the most recently spilled played track that can still be loaded back into the queue's history, returning whether there was one"""
+
+    hist = get_client(ctx_).get_type_dependency(HistoryLog)
+    assert not isinstance(hist, al.abc.Undefined)
+
+    async with access_queue(ctx_, lvc) as q:
+        while q.spilled:
+            rec = await hist.pop(q.history_id)
+            if rec is None:
+                q.spilled = q.spilled_durr = 0
+                break
+            q.spilled -= 1
+            q.spilled_durr -= rec['length']
+
+            if tracks := (await load_tracks(lvc, rec['uri'])).tracks:
+                q.restore_history(
+                    QueueEntry.from_track(tracks[0], hk.Snowflake(rec['requester']))
+                )
+                return True
+    return False
+
+
 async def previous_abs(ctx_: ContextishType, lvc: lv.Lavalink):
     if (
-        q := await get_queue(ctx_, lvc)
-    ).repeat_mode is RepeatMode.NONE and not q.history:
+        (q := await get_queue(ctx_, lvc)).repeat_mode is RepeatMode.NONE
+        and not q.history
+        and not await restore_spilled_history(ctx_, lvc)
+    ):
         await err_say(ctx_, content="❗ This is the start of the queue")
         return
 
     prev = await back(ctx_, lvc)
-    await say(ctx_, show_author=True, content=f"⏮️ **`{prev.track.info.title}`**")
+    await say(ctx_, show_author=True, content=f"⏮️ **`{prev.title}`**")
 
 
 async def seek(
@@ -266,7 +302,7 @@ async def seek(
         raise IllegalArgumentError(Argument(total_ms, 0))
     async with access_queue(ctx, lvc) as q:
         assert q.current is not None
-        if total_ms >= (song_len := q.current.track.info.length):
+        if total_ms >= (song_len := q.current.length):
             raise IllegalArgumentError(Argument(total_ms, song_len))
         q.update_curr_t_started(-total_ms)
         await lvc.seek_millis(ctx.guild_id, total_ms)
@@ -1,4 +1,5 @@
 import typing as t
+import asyncio
 import logging
 import difflib as dfflib
 
@@ -6,9 +7,8 @@ import tanjun as tj
 import alluka as al
 import lavasnek_rs as lv
 
-from .consts import ADD_TRACKS_WRAP_LIM
+from .consts import ADD_TRACKS_WRAP_LIM, LAZY_SHUFFLE_MIN, TRACK_LOAD_CONCURRENCY
 from .extras import (
-    NULL,
     IterableOr,
     Option,
     Fallible,
@@ -17,12 +17,13 @@ from .extras import (
     lgfmt,
     join_and,
 )
-from .dataimpl import LyraDBClientType
+from .dataimpl import GuildConfigCache, UnplayableTracks, ResolvedTracks
 from .errors import (
     Argument,
     IllegalArgumentError,
     InvalidArgumentError,
     NoPlayableTracksError,
+    AlreadyQueuedError,
     OthersInVoiceError,
     PlaybackChangeRefused,
 )
@@ -38,6 +39,7 @@ from .utils import (
 )
 from .cmd import others_not_in_vc_check
 from .lava import (
+    QueueEntry,
     QueueList,
     RepeatMode,
     Trackish,
@@ -45,6 +47,9 @@ from .lava import (
     access_data,
     access_queue,
     get_repeat_emoji,
+    track_cache,
+    load_tracks,
+    normalize_query,
 )
 from .playback import back, skip, while_stop, set_pause
 
@@ -63,25 +68,45 @@ async def to_tracks(
 ) -> Panic[tuple[Trackish, ...]]:
     if source is None:
         source = 'yt'
-    tracks: list[Trackish] = []
-    errors: list[ValueError] = []
     songs = (*map(lambda s: s.strip("<>|"), value.split(' | ')),)
-    async with trigger_thinking(t.cast(AnyContextType, ctx)):
-        for song in songs:
-            query = (
-                song if url_regex.fullmatch(song) else '%ssearch:%s' % (source, song)
+    sem = asyncio.Semaphore(TRACK_LOAD_CONCURRENCY)
+
+    resolved = ctx.get_type_dependency(ResolvedTracks)
+    assert not isinstance(resolved, al.abc.Undefined)
+
+    async def load_search(query: str) -> lv.Tracks:
+        key = normalize_query(query)
+        if key not in track_cache and (uri := await resolved.get(key)):
+            if (loaded := await load_tracks(lvc, uri)).tracks:
+                return loaded
+            await resolved.discard(key)
+
+        loaded = await load_tracks(lvc, query)
+        if loaded.load_type == 'SEARCH_RESULT' and loaded.tracks:
+            info = loaded.tracks[0].info
+            resolved.put_soon(key, info.uri, info.title)
+        return loaded
+
+    async def resolve(song: str) -> Option[Trackish]:
+        async with sem:
+            loaded = await (
+                load_tracks(lvc, song)
+                if url_regex.fullmatch(song)
+                else load_search('%ssearch:%s' % (source, song))
             )
-            query = await lvc.get_tracks(query)
-            if not query.tracks:
-                errors.append(ValueError(song))
-                continue
-            if query.load_type == 'PLAYLIST_LOADED':
-                tracks.append(query)
-                continue
-            tracks.append(query.tracks[0])
+        if not loaded.tracks:
+            return None
+        if loaded.load_type == 'PLAYLIST_LOADED':
+            return loaded
+        return loaded.tracks[0]
+
+    async with trigger_thinking(t.cast(AnyContextType, ctx)):
+        tracks = await asyncio.gather(*map(resolve, songs))
+
+    errors = [ValueError(song) for song, t_ in zip(songs, tracks) if t_ is None]
     if errors:
         raise tj.ConversionError('Some query returns no results', value, errors)
-    return (*tracks,)
+    return (*(t_ for t_ in tracks if t_ is not None),)
 
 
 async def play(
@@ -126,25 +151,29 @@ async def add_tracks_(
             continue
         flttn_t.append(t_)
 
-    mgc = ctx.get_type_dependency(LyraDBClientType)
-    assert not isinstance(mgc, al.abc.Undefined)
-
-    upt = mgc.get_database(  # pyright: ignore [reportUnknownMemberType]
-        'internal'
-    ).get_collection('unplayable-tracks')
-    upt_: set[str] = {_upt['identifier'] for _upt in upt.find()}
+    upt = ctx.get_type_dependency(UnplayableTracks)
+    cfg = ctx.get_type_dependency(GuildConfigCache)
+    assert not isinstance(upt, al.abc.Undefined) and not isinstance(
+        cfg, al.abc.Undefined
+    )
 
-    safe_flttn_t = (*(t_ for t_ in flttn_t if t_.info.identifier not in upt_),)
-    if not safe_flttn_t:
+    playable_t = (*(t_ for t_ in flttn_t if t_.info.identifier not in upt),)
+    if not playable_t:
         raise NoPlayableTracksError
 
-    players = (
-        *(
-            lvc.play(ctx.guild_id, t_).requester(ctx.author.id).replace(False)
-            for t_ in safe_flttn_t
-        ),
-    )
-    queue.ext(*map(lambda p: p.to_track_queue(), players))
+    g_cfg = await cfg.find_one({'id': str(ctx.guild_id)})
+    if g_cfg and g_cfg.get('no_duplicates', False):
+        fresh_t: dict[str, lv.Track] = {}
+        for t_ in playable_t:
+            if not queue.has_track(i := t_.info.identifier):
+                fresh_t.setdefault(i, t_)
+        safe_flttn_t = (*fresh_t.values(),)
+        if not safe_flttn_t:
+            raise AlreadyQueuedError
+    else:
+        safe_flttn_t = playable_t
+
+    queue.ext(*(QueueEntry.from_track(t_, ctx.author.id) for t_ in safe_flttn_t))
 
     if respond:
         playlists = frozenset(t_ for t_ in tracks_ if isinstance(t_, lv.Tracks))
@@ -173,26 +202,51 @@ async def add_tracks_(
         txt = shuffle_txt % (f"{plus_e} Added {enqueued_txt}")
         await say(ctx, follow_up=True, content=txt)
 
-        if (diff := (len(flttn_t) - len(safe_flttn_t))) >= 1:
+        if (diff := (len(flttn_t) - len(playable_t))) >= 1:
             await say(
                 ctx,
                 follow_up=True,
                 hidden=True,
                 content=f"💔 Skipped `{diff}` unplayable track(s)",
             )
+        if (dups := (len(playable_t) - len(safe_flttn_t))) >= 1:
+            await say(
+                ctx,
+                follow_up=True,
+                hidden=True,
+                content=f"♊ Skipped `{dups}` track(s) already in the queue",
+            )
 
-    first = players[0]
     if not queue.is_stopped or ignore_stop:
-        await first.start()
+        await lvc.play(ctx.guild_id, safe_flttn_t[0]).requester(ctx.author.id).replace(
+            False
+        ).start()
     if shuffle:
-        queue.shuffle()
+        queue.shuffle(lazy=len(queue.upcoming) >= LAZY_SHUFFLE_MIN)
 
     return (*safe_flttn_t,)
 
 
+def to_queue_index(q: QueueList, track: str, /) -> Fallible[int]:
+    """Resolves a track given by either its position or its name into its index in the queue"""
+
+    q.settle()
+    if track.isdigit():
+        if not (1 <= (t_ := int(track)) <= len(q)):
+            raise IllegalArgumentError(Argument(t_, (1, len(q))))
+        return t_ - 1
+
+    if (i := q.find_title(track)) is not None:
+        return i
+    return max(
+        range(len(q)),
+        key=lambda i: dfflib.SequenceMatcher(None, q[i].title, track).ratio(),
+    )
+
+
 async def remove_track(
     ctx: tj.abc.Context, track: Option[str], lvc: lv.Lavalink, /
-) -> Fallible[lv.TrackQueue]:
+) -> Fallible[QueueEntry]:
     assert ctx.guild_id
 
     async with access_data(ctx.guild_id, lvc) as d:
@@ -203,20 +257,9 @@ async def remove_track(
                 raise InvalidArgumentError(Argument(track, None))
             rm = np
             i = q.pos
-        elif track.isdigit():
-            t = int(track)
-            if not (1 <= t <= len(q)):
-                raise IllegalArgumentError(Argument(t, (1, len(q))))
-            i = t - 1
-            rm = q[i]
         else:
-            rm = max(
-                q,
-                key=lambda t: dfflib.SequenceMatcher(
-                    None, t.track.info.title, track
-                ).ratio(),
-            )
-            i = q.index(rm)
+            i = to_queue_index(q, track)
+            rm = q[i]
 
         try:
             await others_not_in_vc_check(ctx, lvc)
@@ -232,21 +275,32 @@ async def remove_track(
 
         if i < q.pos:
             q.pos = max(0, q.pos - 1)
-        q.sub(rm)
+        q.remove_at(i)
 
         logger.info(
-            f"In guild {ctx.guild_id} track [{i: >3}/{len(q): >3}] removed: '{rm.track.info.title}'"
+            f"In guild {ctx.guild_id} track [{i: >3}/{len(q): >3}] removed: '{rm.title}'"
         )
     return rm
 
 
+async def remove_duplicate_tracks(ctx: tj.abc.Context, lvc: lv.Lavalink, /) -> int:
+    assert ctx.guild_id
+
+    async with access_queue(ctx, lvc) as q:
+        n = q.remove_duplicates()
+
+    logger.info(f"In guild {ctx.guild_id} {n} duplicate track(s) removed")
+    return n
+
+
 async def remove_tracks(
     ctx: tj.abc.Context, start: int, end: int, lvc: lv.Lavalink, /
-) -> Fallible[list[lv.TrackQueue]]:
+) -> Fallible[list[QueueEntry]]:
     assert ctx.guild_id
 
     async with access_data(ctx.guild_id, lvc) as d:
         q = d.queue
+        q.settle()
         if not (1 <= start <= end <= len(q)):
             raise IllegalArgumentError(Argument((start, end), (1, len(q))))
 
@@ -262,10 +316,10 @@ async def remove_tracks(
                     await lvc.play(ctx.guild_id, next_t.track).start()
         if i_s < q.pos:
             q.pos = max(0, i_s + (q.pos - i_e - 1))
-        q.sub(*rm)
+        q.remove_range(i_s, end)
 
         logger.info(
-            f"""In guild {ctx.guild_id} tracks [{i_s: >3}~{i_e: >3}/{len(q): >3}] removed: '{', '.join(("'%s'" %  t.track.info.title) for t in rm)}'"""
+            f"""In guild {ctx.guild_id} tracks [{i_s: >3}~{i_e: >3}/{len(q): >3}] removed: '{', '.join(("'%s'" %  t.title) for t in rm)}'"""
         )
     return rm
 
@@ -285,8 +339,8 @@ async def shuffle_abs(ctx_: ContextishType, lvc: lv.Lavalink):
 
 
 async def insert_track(
-    ctx: tj.abc.Context, insert: int, track: Option[int], lvc: lv.Lavalink, /
-) -> Fallible[lv.TrackQueue]:
+    ctx: tj.abc.Context, insert: int, track: Option[str], lvc: lv.Lavalink, /
+) -> Fallible[QueueEntry]:
     assert ctx.guild_id
 
     async with access_data(ctx.guild_id, lvc) as d:
@@ -299,7 +353,7 @@ async def insert_track(
             t_ = p_
             ins = np
         else:
-            t_ = track - 1
+            t_ = to_queue_index(q, track)
             ins = q[t_]
 
         i_ = insert - 1
@@ -322,9 +376,7 @@ async def insert_track(
                     ctx, lvc, advance=False, reset_repeat=True, change_stop=False
                 )
 
-        q[t_] = t.cast(lv.TrackQueue, NULL)
-        q.insert(insert, ins)
-        q.remove(t.cast(lv.TrackQueue, NULL))
+        q.move(t_, i_ if t_ < i_ else insert)
     return ins
 
 
@@ -22,7 +22,7 @@ from ..extras import (
     limit_bytes_img_size,
     url_to_bytesio,
 )
-from ..dataimpl import LyraDBCollectionType
+from ..dataimpl import GuildConfigCache
 from .vars import RESTRICTOR, base_h
 from .types import (
     ChannelAware,
@@ -466,25 +466,20 @@ def with_message_command_group_template(func: t.Callable[_P_mgT, t.Awaitable[Non
 
 
 async def restricts_c(
-    ctx: tj.abc.Context, /, *, cfg: al.Injected[LyraDBCollectionType]
+    ctx: tj.abc.Context, /, *, cfg: al.Injected[GuildConfigCache]
 ) -> bool:
     if not (ctx.guild_id and ctx.member):
         return True
 
-    g_cfg = cfg.find_one({'id': str(ctx.guild_id)})
-    assert g_cfg
+    policy = await cfg.get_policy(str(ctx.guild_id))
 
-    res_ch: dict[str, t.Any] = g_cfg.get('restricted_ch', {})
-    res_r: dict[str, t.Any] = g_cfg.get('restricted_r', {})
-    res_u: dict[str, t.Any] = g_cfg.get('restricted_u', {})
+    ch_wl = policy.ch_wl
+    r_wl = policy.r_wl
+    u_wl = policy.u_wl
 
-    ch_wl = res_ch.get('wl_mode', 0)
-    r_wl = res_r.get('wl_mode', 0)
-    u_wl = res_u.get('wl_mode', 0)
-
-    res_ch_all: set[int] = {*(map(int, res_ch.setdefault('all', [])))}
-    res_r_all: set[int] = {*(map(int, res_r.setdefault('all', [])))}
-    res_u_all: set[int] = {*(map(int, res_u.setdefault('all', [])))}
+    res_ch_all = policy.ch_all
+    res_r_all = policy.r_all
+    res_u_all = policy.u_all
 
     author_perms = await tj.permissions.fetch_permissions(
         ctx.client, ctx.member, channel=ctx.channel_id
@@ -503,11 +498,11 @@ async def restricts_c(
         return False
 
     if r_wl == 1:
-        if not (cond := bool({*ctx.member.role_ids} & res_r_all)):
+        if not (cond := not res_r_all.isdisjoint(ctx.member.role_ids)):
             await ephim_say(ctx, content="🚷 You aren't role whitelisted to use the bot")
         return cond
 
-    if r_wl == -1 and {*ctx.member.role_ids} & res_r_all:
+    if r_wl == -1 and not res_r_all.isdisjoint(ctx.member.role_ids):
         await ephim_say(ctx, content="🚷 You are role blacklisted from using the bot")
         return False
 
@@ -573,16 +568,9 @@ async def on_error(ctx: tj.abc.Context, error: Exception) -> bool:
 
 @base_h.with_pre_execution
 async def pre_execution(
-    ctx: tj.abc.Context, cfg: al.Injected[LyraDBCollectionType]
+    ctx: tj.abc.Context, cfg: al.Injected[GuildConfigCache]
 ) -> None:
-    g_id = str(ctx.guild_id)
-    flt = {'id': g_id}
-
-    if _g_cfg := cfg.find_one(flt):
-        g_cfg = _g_cfg
-    else:
-        cfg.insert_one(flt)
-        g_cfg: dict[str, t.Any] = flt.copy()
+    g_cfg = await cfg.get_or_create(str(ctx.guild_id))
 
     if not g_cfg.get('auto_hide_embeds', True) or not isinstance(
         ctx, tj.abc.MessageContext
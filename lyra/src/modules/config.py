@@ -10,11 +10,10 @@ from ..lib.extras import (
     flatten,
     fmt_str,
     join_and,
-    map_in_place,
     uniquify,
     split_preset,
 )
-from ..lib.dataimpl import LyraDBCollectionType
+from ..lib.dataimpl import BlacklistMode, GuildConfigCache
 from ..lib.utils import (
     Fore,
     RESTRICTOR,
@@ -45,7 +44,6 @@ config = __init_component__(__name__)
 
 valid_mentionables: t.Final = {'Channels': 'ch', 'Roles': 'r', 'Members': 'u'}
 inv_mentionables: t.Final = {v: k for k, v in valid_mentionables.items()}
-BlacklistMode = t.Literal[-1, 0, 1]
 CategoryType = t.Literal['ch', 'r', 'u']
 
 all_mentionable_categories = split_preset(
@@ -99,7 +97,7 @@ async def to_multi_mentionables(
 
 async def restrict_mode_set(
     ctx: tj.abc.Context,
-    cfg: LyraDBCollectionType,
+    cfg: GuildConfigCache,
     /,
     *,
     category: str,  # TODO: change this to `CategoryType` once 3.11 is out
@@ -109,28 +107,31 @@ async def restrict_mode_set(
     assert ctx.guild_id
     flt = {'id': str(ctx.guild_id)}
 
-    g_cfg = cfg.find_one(flt)
+    g_cfg = await cfg.find_one(flt)
     assert g_cfg
 
     cat_name = inv_mentionables[category]
     mode_name = _c(mode)
 
-    res: dict[str, t.Any] = g_cfg.setdefault('restricted_%s' % category, {})
+    res: dict[str, t.Any] = g_cfg.get('restricted_%s' % category, {})
+    delta: dict[str, t.Any] = {}
 
     if wipe:
-        res.setdefault('all', []).clear()
+        delta['restricted_%s.all' % category] = []
         wipe_msg = " and cleared all %s(s) from the restricted list" % cat_name.lower()
     else:
         wipe_msg = ""
 
     if res.get('wl_mode', 0) == mode:
+        if delta:
+            await cfg.update_one(flt, {'$set': delta})
         await say(
             ctx,
             hidden=True,
             content=f"""{'🧹' if wipe else '❕'} Already set {cat_name.lower()} restricted mode to *{mode_name}*{wipe_msg.replace('and', 'but also', 1)}""",
         )
         return
-    res['wl_mode'] = mode
+    delta['restricted_%s.wl_mode' % category] = mode
 
     if mode == 0:
         msg = f"""🔐{_e(mode)}{'🧹' if wipe else ''} Cleared {cat_name.lower()} restriction mode{wipe_msg}"""
@@ -138,12 +139,12 @@ async def restrict_mode_set(
         msg = f"🔐{_e(mode)} Set *{cat_name.lower()}* restriction mode to **`{mode_name}`**"
 
     await say(ctx, content=msg)
-    cfg.find_one_and_replace(flt, g_cfg)
+    await cfg.update_one(flt, {'$set': delta})
 
 
 async def restrict_list_edit(
     ctx: tj.abc.Context,
-    cfg: LyraDBCollectionType,
+    cfg: GuildConfigCache,
     /,
     *,
     mentionables: t.Collection[PartialMentionableType],
@@ -152,23 +153,23 @@ async def restrict_list_edit(
     assert ctx.guild_id
     flt = {'id': str(ctx.guild_id)}
 
-    g_cfg = cfg.find_one(flt)
+    g_cfg = await cfg.find_one(flt)
     assert g_cfg
 
-    res_ch = g_cfg.setdefault('restricted_ch', {})
-    res_r = g_cfg.setdefault('restricted_r', {})
-    res_u = g_cfg.setdefault('restricted_u', {})
+    res_ch: dict[str, t.Any] = g_cfg.get('restricted_ch', {})
+    res_r: dict[str, t.Any] = g_cfg.get('restricted_r', {})
+    res_u: dict[str, t.Any] = g_cfg.get('restricted_u', {})
 
-    res_ch_all: list[str] = res_ch.setdefault('all', [])
-    res_r_all: list[str] = res_r.setdefault('all', [])
-    res_u_all: list[str] = res_u.setdefault('all', [])
+    res_all: frozenset[str] = frozenset(
+        flatten(res.get('all', ()) for res in (res_ch, res_r, res_u))
+    )
 
     new_ch: list[str] = []
     new_r: list[str] = []
     new_u: list[str] = []
 
     for u in uniquify(mentionables):
-        u_in_list = (u_id := str(u.id)) in res_ch_all + res_r_all + res_u_all
+        u_in_list = (u_id := str(u.id)) in res_all
         if u_in_list if mode == '+' else not u_in_list:
             continue
         if isinstance(u, hk.PartialChannel):
@@ -199,19 +200,17 @@ async def restrict_list_edit(
         )
     )
 
-    if mode == '+':
-        res_ch_all.extend(new_ch)
-        res_r_all.extend(new_r)
-        res_u_all.extend(new_u)
-    else:
-        map_in_place(lambda ch: res_ch_all.remove(ch), new_ch)
-        map_in_place(lambda r: res_r_all.remove(r), new_r)
-        map_in_place(lambda u: res_u_all.remove(u), new_u)
+    deltas = {
+        'restricted_%s.all' % cat: ({'$each': new} if mode == '+' else {'$in': new})
+        for cat, new in (('ch', new_ch), ('r', new_r), ('u', new_u))
+        if new
+    }
 
     msg = f"🔐 {delta_act} {deltas_msg}" if deltas_msg else delta_txt_skipped
 
     await say(ctx, content=msg)
-    cfg.find_one_and_replace(flt, g_cfg)
+    if deltas:
+        await cfg.update_one(flt, {'$addToSet' if mode == '+' else '$pull': deltas})
 
 
 # /config
@@ -268,13 +267,11 @@ prefix_sg_s = with_identifier(C.CONFIG_PREFIX)(
 # -
 @prefix_sg_m.as_sub_command('list', 'l', '.')
 @prefix_sg_s.as_sub_command('list', "Lists all usable prefixes of the bot")
-async def prefix_list_(
-    ctx: tj.abc.Context, cfg: al.Injected[LyraDBCollectionType]
-) -> None:
+async def prefix_list_(ctx: tj.abc.Context, cfg: al.Injected[GuildConfigCache]) -> None:
     """Lists all usable prefixes of the bot"""
 
     assert ctx.guild_id
-    g_cfg = cfg.find_one({'id': str(ctx.guild_id)})
+    g_cfg = await cfg.find_one({'id': str(ctx.guild_id)})
     assert g_cfg
 
     g_prefixes: list[str] = g_cfg.setdefault('prefixes', [])
@@ -302,7 +299,7 @@ async def prefix_list_(
 @prefix_sg_s.as_sub_command('add', "Adds a new prefix of the bot for this guild")
 async def prefix_add_(
     ctx: tj.abc.Context,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
     prefix: t.Annotated[ja.Str, "What prefix?"],
 ):
     """Adds a new prefix of the bot for this guild"""
@@ -310,7 +307,7 @@ async def prefix_add_(
     assert ctx.guild_id
     flt = {'id': str(ctx.guild_id)}
 
-    g_cfg = cfg.find_one(flt)
+    g_cfg = await cfg.find_one(flt)
     assert g_cfg
 
     g_prefixes: list[str] = g_cfg.setdefault('prefixes', [])
@@ -319,11 +316,10 @@ async def prefix_add_(
         await err_say(ctx, content=f"❗ Already defined this prefix")
         return
 
-    g_prefixes.append(prefix)
     await say(
         ctx, content=f"**`「／」+`** Added `{prefix}` as a new prefix for this guild"
     )
-    cfg.find_one_and_replace(flt, g_cfg)
+    await cfg.update_one(flt, {'$addToSet': {'prefixes': prefix}})
 
 
 ### /config prefix remove
@@ -338,7 +334,7 @@ async def prefix_add_(
 )
 async def prefix_remove_(
     ctx: tj.abc.Context,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
     prefix: t.Annotated[ja.Str, "Which prefix?"],
 ):
     """Removes an existing prefix of the bot for this guild"""
@@ -346,7 +342,7 @@ async def prefix_remove_(
     assert ctx.guild_id
     flt = {'id': str(ctx.guild_id)}
 
-    g_cfg = cfg.find_one(flt)
+    g_cfg = await cfg.find_one(flt)
     assert g_cfg
 
     g_prefixes: list[str] = g_cfg.setdefault('prefixes', [])
@@ -359,9 +355,8 @@ async def prefix_remove_(
         await err_say(ctx, content=f"❗ No such prefix found")
         return
 
-    g_prefixes.remove(prefix)
     await say(ctx, content=f"**`「／」ー`** Removed the prefix `{prefix}` for this guild")
-    cfg.find_one_and_replace(flt, g_cfg)
+    await cfg.update_one(flt, {'$pull': {'prefixes': prefix}})
 
 
 ## /config nowplayingmsg
@@ -400,26 +395,67 @@ nowplayingmsg_sg_s = with_identifier(C.CONFIG_NOWPLAYINGMSG)(
     'toggle', "Toggles the now playing messages to be automatically sent or not"
 )
 async def nowplayingmsg_toggle_(
-    ctx: tj.abc.Context, cfg: al.Injected[LyraDBCollectionType]
+    ctx: tj.abc.Context, cfg: al.Injected[GuildConfigCache]
 ):
     """Toggles the now playing messages to be automatically sent or not"""
 
     assert ctx.guild_id
-    flt = {'id': str(ctx.guild_id)}
+    send_np_msg = await cfg.toggle(str(ctx.guild_id), 'send_nowplaying_msg')
 
-    g_cfg = cfg.find_one(flt)
-    assert g_cfg
+    msg = (
+        "🔔 Sending now playing messages from now on"
+        if send_np_msg
+        else "🔕 Not sending now playing messages from now on"
+    )
+    await say(ctx, content=msg)
+
+
+## /config noduplicates
+
+
+@with_identifier(C.CONFIG_NODUPLICATES)
+# -
+@config_g_m.with_command
+@tj.as_message_command_group(
+    'noduplicates', 'no-duplicates', 'nodupes', 'nodup', 'nd', strict=True
+)
+@with_message_command_group_template
+async def noduplicates_sg_m(_: tj.abc.MessageContext):
+    """Manages whether tracks already in the queue can be added again"""
+    ...
+
+
+noduplicates_sg_s = with_identifier(C.CONFIG_NODUPLICATES)(
+    config_g_s.with_command(
+        tj.slash_command_group(
+            'no-duplicates',
+            "Manages whether tracks already in the queue can be added again",
+        )
+    )
+)
+
+
+### /config noduplicates toggle
 
-    send_np_msg: bool = g_cfg.setdefault('send_nowplaying_msg', False)
 
-    g_cfg['send_nowplaying_msg'] = not send_np_msg
+@with_author_permission_check(hk.Permissions.MANAGE_GUILD)(C.CONFIG_NODUPLICATES_TOGGLE)
+# -
+@noduplicates_sg_m.as_sub_command('toggle', 'tggl', 't')
+@noduplicates_sg_s.as_sub_command(
+    'toggle', "Toggles tracks already in the queue to be skipped when added or not"
+)
+async def noduplicates_toggle_(ctx: tj.abc.Context, cfg: al.Injected[GuildConfigCache]):
+    """Toggles tracks already in the queue to be skipped when added or not"""
+
+    assert ctx.guild_id
+    no_dups = await cfg.toggle(str(ctx.guild_id), 'no_duplicates')
+
     msg = (
-        "🔕 Not sending now playing messages from now on"
-        if send_np_msg
-        else "🔔 Sending now playing messages from now on"
+        "♊ Skipping tracks already in the queue from now on"
+        if no_dups
+        else "👯 Allowing tracks already in the queue from now on"
     )
     await say(ctx, content=msg)
-    cfg.find_one_and_replace(flt, g_cfg)
 
 
 ## /config restrict
@@ -453,11 +489,11 @@ restrict_sg_s = with_identifier(C.CONFIG_RESTRICT)(
 @restrict_sg_s.as_sub_command(
     'list', "Shows the current restricted channels, roles and members"
 )
-async def restrict_list_(ctx: tj.abc.Context, cfg: al.Injected[LyraDBCollectionType]):
+async def restrict_list_(ctx: tj.abc.Context, cfg: al.Injected[GuildConfigCache]):
     """Shows the current restricted channels, roles and members"""
 
     assert ctx.guild_id
-    g_cfg = cfg.find_one({'id': str(ctx.guild_id)})
+    g_cfg = await cfg.find_one({'id': str(ctx.guild_id)})
     assert g_cfg
 
     res_ch: dict[str, t.Any] = g_cfg.get('restricted_ch', {})
@@ -505,7 +541,7 @@ async def restrict_list_(ctx: tj.abc.Context, cfg: al.Injected[LyraDBCollectionT
 # TODO: Remove tyoe casting when tanjun relaxed converter func sig
 async def restrict_add_(
     ctx: tj.abc.MessageContext,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
     mentionables: t.Annotated[
         ja.Greedy[
             ja.Converted[
@@ -541,7 +577,7 @@ async def restrict_add_(
 # TODO: Remove type casting when tanjun relaxed converter func sig
 async def restrict_remove_(
     ctx: tj.abc.MessageContext,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
     mentionables: t.Annotated[
         ja.Greedy[
             ja.Converted[
@@ -576,7 +612,7 @@ async def restrict_remove_(
 )
 async def restrict_blacklist_(
     ctx: tj.abc.Context,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
     category: t.Annotated[
         ja.Converted[to_mentionable_category],
         "Which category?",
@@ -600,7 +636,7 @@ async def restrict_blacklist_(
 )
 async def restrict_whitelist_(
     ctx: tj.abc.Context,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
     category: t.Annotated[
         ja.Converted[to_mentionable_category],
         "Which category?",
@@ -622,7 +658,7 @@ async def restrict_whitelist_(
 @restrict_sg_s.as_sub_command('clear', "Clears a category's restriction mode")
 async def restrict_clear_(
     ctx: tj.abc.Context,
-    cfg: al.Injected[LyraDBCollectionType],
+    cfg: al.Injected[GuildConfigCache],
     category: t.Annotated[
         ja.Converted[to_mentionable_category],
         "Which category?",
@@ -646,24 +682,25 @@ async def restrict_clear_(
 # -
 @restrict_sg_m.as_sub_command('wipe', 'reset', 'wp')
 @restrict_sg_s.as_sub_command('wipe', "Wipes the restricted list of EVERY category")
-async def restrict_wipe_(ctx: tj.abc.Context, cfg: al.Injected[LyraDBCollectionType]):
+async def restrict_wipe_(ctx: tj.abc.Context, cfg: al.Injected[GuildConfigCache]):
     """Wipes the restricted list of EVERY category"""
 
     assert ctx.guild_id
     flt = {'id': str(ctx.guild_id)}
 
-    g_cfg = cfg.find_one(flt)
-    assert g_cfg
-
-    g_cfg['restricted_ch'] = {'all': [], 'wl_mode': 0}
-    g_cfg['restricted_r'] = {'all': [], 'wl_mode': 0}
-    g_cfg['restricted_u'] = {'all': [], 'wl_mode': 0}
-
     await say(
         ctx,
         content="🔐🧹 Wiped all restricted channels, roles and members list and cleared the restriction modes",
     )
-    cfg.find_one_and_replace(flt, g_cfg)
+    await cfg.update_one(
+        flt,
+        {
+            '$set': {
+                'restricted_%s' % cat: {'all': [], 'wl_mode': 0}
+                for cat in ('ch', 'r', 'u')
+            }
+        },
+    )
 
 
 # -
@@ -21,6 +21,7 @@ from ..lib.lava import (
     AutomaticConnectionChangeEvent,
     NodeDataRef,
     get_data,
+    is_connected,
 )
 from ..lib.music import __init_component__
 from ..lib.connections import logger, cleanup, join_impl_precaught, leave
@@ -60,7 +61,7 @@ async def on_voice_state_update(
     new = event.state
     old = event.old_state
 
-    if not await lvc.get_guild_node(event.guild_id):
+    if not is_connected(event.guild_id):
         return
 
     bot_u = bot.get_me()
@@ -1,13 +1,34 @@
+import os
+import gc
 import typing as t
 import logging
 import pathlib as pl
+import itertools as it
+import tracemalloc
 
 import hikari as hk
 import tanjun as tj
+import alluka as al
+import lavasnek_rs as lv
 import tanjun.annotations as ja
 
-from ..lib.extras import lgfmt
+from ..lib.extras import Option, lgfmt
+from ..lib.dataimpl import GuildConfigCache, ResolvedTracks
+from ..lib.lava import (
+    QueueEntry,
+    track_cache,
+    empty_track_cache,
+    inflight_track_loads,
+    decoded_track_cache,
+    queued_tracks,
+    interned_track_metas,
+    auto_search_tracks,
+    sessions,
+)
 from ..lib.utils import (
+    Fore,
+    ANSI_BLOCK,
+    cl,
     say,
     err_say,
     with_annotated_args_wrapped,
@@ -198,6 +219,185 @@ async def delete_all_app_commands(ctx: tj.abc.Context):
     await say(ctx, follow_up=True, content="⚙️🗑️ Done")
 
 
+## /debug stats
+
+
+def _stat(name: str, value: object):
+    return "{} {}".format(cl(f"{name:<24}", fore=Fore.D), cl(str(value), fore=Fore.C))
+
+
+def _stats(*stats: str):
+    return ANSI_BLOCK % '\n'.join(stats)
+
+
+@with_identifier(C.DEBUG_STATS)
+# -
+@debug_g_m.as_sub_command('stats', 'stat', 'st')
+@debug_g_s.as_sub_command('stats', "Shows the bot's internal cache statistics")
+async def stats_(
+    ctx: tj.abc.Context,
+    cfg: al.Injected[GuildConfigCache],
+    resolved: al.Injected[ResolvedTracks],
+):
+    """Shows the bot's internal cache statistics"""
+
+    hits = track_cache.hits + empty_track_cache.hits
+    actors = [d.actor for d in sessions.values()]
+
+    embed = (
+        hk.Embed(title="⚙️📊 Internal statistics")
+        .add_field(
+            "Guild configs",
+            _stats(
+                _stat("Hits", cfg.hits),
+                _stat("Misses", cfg.misses),
+                _stat("Hit ratio", f"{cfg.hit_ratio:.2%}"),
+            ),
+        )
+        .add_field(
+            "Track loads",
+            _stats(
+                _stat("Cached", f"{len(track_cache)}/{track_cache.maxsize}"),
+                _stat("Hits", track_cache.hits),
+                _stat("Empty hits", empty_track_cache.hits),
+                _stat("Misses", loads := empty_track_cache.misses),
+                _stat("Collapsed", inflight_track_loads.collapsed),
+                _stat("Hit ratio", f"{hits / ((hits + loads) or 1):.2%}"),
+            ),
+        )
+        .add_field(
+            "Resolved searches",
+            _stats(
+                _stat("Hits", resolved.hits),
+                _stat("Misses", resolved.misses),
+            ),
+        )
+        .add_field(
+            "Track metadata",
+            _stats(_stat("Interned", interned_track_metas())),
+        )
+        .add_field(
+            "Decoded tracks",
+            _stats(
+                _stat("Queued", queued_tracks()),
+                _stat(
+                    "Cached",
+                    f"{len(decoded_track_cache)}/{decoded_track_cache.maxsize}",
+                ),
+                _stat("Hits", decoded_track_cache.hits),
+                _stat("Misses", decoded_track_cache.misses),
+            ),
+        )
+        .add_field(
+            "Guild actors",
+            _stats(
+                _stat("Sessions", len(actors)),
+                _stat("Queued", sum(a_.depth for a_ in actors)),
+                _stat("Deepest mailbox", max((a_.depth for a_ in actors), default=0)),
+                _stat(
+                    "Longest wait",
+                    f"{max((a_.max_wait for a_ in actors), default=0) * 1000:.1f}ms",
+                ),
+            ),
+        )
+    )
+    if ctx.guild_id and (d := sessions.get(ctx.guild_id)):
+        embed.add_field(
+            "This guild's actor",
+            _stats(
+                _stat("Queued", d.actor.depth),
+                _stat("Processed", d.actor.processed),
+                _stat("Mean wait", f"{d.actor.mean_wait * 1000:.1f}ms"),
+                _stat("Mean hold", f"{d.actor.mean_hold * 1000:.1f}ms"),
+                _stat("Longest wait", f"{d.actor.max_wait * 1000:.1f}ms"),
+            ),
+        )
+    await say(ctx, embed=embed)
+
+
+## /debug queue-memory
+
+
+def _measure_memory(build: t.Callable[[], object], /) -> tuple[int, Option[int]]:
+    def rss() -> Option[int]:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    gc.collect()
+    rss_before = rss()
+    tracemalloc.start()
+    try:
+        built = build()
+        traced = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    rss_after = rss()
+    del built
+
+    if rss_before is None or rss_after is None:
+        return traced, None
+    return traced, rss_after - rss_before
+
+
+@with_annotated_args_wrapped
+@with_identifier(C.DEBUG_QUEUEMEMORY)
+# -
+@debug_g_m.as_sub_command('queue-memory', 'queuememory', 'qmem', 'qm')
+@debug_g_s.as_sub_command(
+    'queue-memory', "Compares the memory used by the queue entry representations"
+)
+async def queue_memory_(
+    ctx: tj.abc.Context,
+    lvc: al.Injected[lv.Lavalink],
+    query: t.Annotated[ja.Str, "Build the entries from the tracks of what query?"],
+    count: t.Annotated[
+        ja.Int, ja.Ranged(1, 100_000), "How many entries? (If not given, 10000)"
+    ] = 10_000,
+):
+    """Compares the per-entry wrapper overhead of `lv.TrackQueue` against `QueueEntry`"""
+
+    if not ctx.guild_id:
+        await err_say(ctx, content="❗ This command must be used in a guild")
+        return
+    if not (tracks := (await auto_search_tracks(lvc, query)).tracks):
+        await err_say(ctx, content="❓ No tracks found")
+        return
+
+    guild = ctx.guild_id
+    sample = [*it.islice(it.cycle(tracks), count)]
+    # Both sides are built from the same already-loaded `lv.Track`s, which the
+    # `lv.TrackQueue` side clones and the `QueueEntry` side shares, so this only
+    # measures the wrapper overhead, not the cost of the tracks themselves
+    track_queues = _measure_memory(
+        lambda: [
+            lvc.play(guild, t_).requester(ctx.author.id).to_track_queue()
+            for t_ in sample
+        ]
+    )
+    entries = _measure_memory(
+        lambda: [QueueEntry.from_track(t_, ctx.author.id) for t_ in sample]
+    )
+
+    def fmt(traced: int, rss: Option[int]):
+        return _stats(
+            _stat("Python heap", f"{traced / count:,.0f} B/entry"),
+            _stat(
+                "Resident set",
+                "N/A" if rss is None else f"{rss / count:,.0f} B/entry",
+            ),
+        )
+
+    embed = (
+        hk.Embed(title=f"⚙️📊 Queue memory ({count:,} entries)")
+        .add_field("lv.TrackQueue", fmt(*track_queues))
+        .add_field("QueueEntry", fmt(*entries))
+    )
+    await say(ctx, embed=embed)
+
+
 # -
 
 
@@ -7,7 +7,15 @@ import lavasnek_rs as lv
 import tanjun.annotations as ja
 
 from ..lib.consts import Q_CHUNK, TIMEOUT
-from ..lib.extras import Option, Fallible, to_stamp, wr, get_lyrics
+from ..lib.extras import (
+    Option,
+    Fallible,
+    to_ms,
+    to_stamp,
+    wr,
+    curr_time_ms,
+    get_lyrics,
+)
 from ..lib.errors import QueryEmptyError, LyricsNotFoundError
 from ..lib.utils import (
     Fore,
@@ -32,8 +40,13 @@ from ..lib.cmd import (
     with_identifier,
     get_full_cmd_repr_from_identifier,
 )
-from ..lib.lava import get_queue, access_queue
-from ..lib.music import generate_queue_embeds, __init_component__
+from ..lib.lava import RepeatMode, get_queue, access_queue, auto_search_tracks
+from ..lib.music import (
+    SpilledQueuePages,
+    generate_queue_embeds,
+    queue_base_embed,
+    __init_component__,
+)
 from ..lib.playback import stop, unstop
 from ..lib.queue import play, add_tracks_
 
@@ -71,23 +84,22 @@ async def nowplaying_(
     assert curr_t
     assert q.np_time
 
-    t_info = curr_t.track.info
     req = ctx.cache.get_member(ctx.guild_id, curr_t.requester)
     assert req is not None
 
-    title_pad = int(len(t_info.title) // 1.143)
+    title_pad = int(len(curr_t.title) // 1.143)
     username_pad = (27 * len(ctx.member.display_name) + 97) // 31
     padding = min(54, max(title_pad, username_pad)) - 2
 
-    song_len = to_stamp(t_info.length)
+    song_len = to_stamp(curr_t.length)
     np_pos = to_stamp(q.np_time)
 
     progress = round(
-        (q.np_time / t_info.length) * (padding + 12 - len(''.join((np_pos, song_len))))
+        (q.np_time / curr_t.length) * (padding + 12 - len(''.join((np_pos, song_len))))
     )
 
     desc = (
-        f'👤 **{t_info.author}**',
+        f'👤 **{curr_t.author}**',
         f"{e} `{np_pos:─<{padding}}{song_len:─>12}`".replace('─', ' ', 1)[::-1]
         .replace('─', ' ', 1)[::-1]
         .replace('─', '▬', progress),
@@ -99,9 +111,9 @@ async def nowplaying_(
         thumb = limit_img_size_by_guild(thumb, ctx, ctx.cache)
     embed = (
         hk.Embed(
-            title=f"{'🎶 ' if q.is_playing else ''}__**`#{q.pos + 1}`**__  {t_info.title}",
+            title=f"{'🎶 ' if q.is_playing else ''}__**`#{q.pos + 1}`**__  {curr_t.title}",
             description="%s\n\n%s" % desc,
-            url=t_info.uri,
+            url=curr_t.uri,
             color=color,
             # timestamp=dt.datetime.now().astimezone(),
         )
@@ -116,6 +128,53 @@ async def nowplaying_(
     await say(ctx, hidden=True, embed=embed)
 
 
+# /playing-in
+
+
+with_pi_cmd_check = with_cmd_checks(Checks.CONN | Checks.QUEUE)
+
+
+@with_annotated_args_wrapped
+@with_pi_cmd_check(C.PLAYINGIN)
+# -
+@tj.as_slash_command('playing-in', "Shows which track will be playing after a while")
+@tj.as_message_command('playing-in', 'playingin', 'pin', 'when')
+async def playing_in_(
+    ctx: tj.abc.Context,
+    lvc: al.Injected[lv.Lavalink],
+    after: t.Annotated[
+        ja.Converted[to_ms],
+        "After how long? (Must be in format such as 45m, 1:30:00)",
+    ],
+) -> None:
+    """Shows which track will be playing after a while"""
+
+    q = await get_queue(ctx, lvc)
+    # Offsets are into the whole queue, including the played tracks spilled out of it
+    now = q.spilled_durr + q.history_durr + (q.np_time or 0)
+    at = now + after - q.spilled_durr
+
+    if q.repeat_mode is RepeatMode.ONE and q.current:
+        i = q.pos
+    else:
+        if q.repeat_mode is RepeatMode.ALL and q.total_durr:
+            at %= q.total_durr
+        i = q.index_at(at) if at >= 0 else None
+
+    if i is None:
+        await err_say(
+            ctx,
+            content=f"❗ The queue would have ended by then. *(`{to_stamp(q.spilled_durr + q.total_durr - now)}` left)*",
+        )
+        return
+
+    at_unix = (curr_time_ms() + after) // 1_000
+    await say(
+        ctx,
+        content=f"🕰️ At <t:{at_unix}:t>, track `{i + 1}` (`{q[i].title}`) will be playing",
+    )
+
+
 # /search
 
 
@@ -169,7 +228,7 @@ async def _search(ctx: tj.abc.Context, query: str, lvc: lv.Lavalink) -> Fallible
     assert not isinstance(bot, al.abc.Undefined)
 
     async with trigger_thinking(t.cast(AnyContextType, ctx)):
-        results = await lvc.auto_search_tracks(query)
+        results = await auto_search_tracks(lvc, query)
     if results.load_type in {'TRACK_LOADED', 'PLAYLIST_LOADED'}:
         play_r = get_full_cmd_repr_from_identifier(C.PLAY, ctx)
 
@@ -368,8 +427,9 @@ async def queue_(
     emj: al.Injected[EmojiCache],
 ):
     q = await get_queue(ctx, lvc)
-    pages = (*(await generate_queue_embeds(ctx, lvc)),)
-    pages_n = len(pages)
+    pages = [*(await generate_queue_embeds(ctx, lvc))]
+    spilled = SpilledQueuePages.of(q)
+    base = queue_base_embed(q)
 
     def _page_row(*, cancel_b: bool = False):
         row = ctx.rest.build_action_row()
@@ -407,13 +467,18 @@ async def queue_(
 
     def _update_buttons(b: hk.api.ButtonBuilder[hk.api.ActionRowBuilder]):
         return (
-            (not pages[:i] and b.emoji == emj['prev_b'])
+            (not pages[:i] and spilled.exhausted and b.emoji == emj['prev_b'])
             or (not pages[i + 1 :] and b.emoji == emj['next_b'])
             or (i == 0 and b.emoji == emj['first_b'])
-            or (i == pages_n - 1 and b.emoji == emj['last_b'])
+            or (i == len(pages) - 1 and b.emoji == emj['last_b'])
         )
 
-    embed = pages[i].set_author(name=f"Page {i+1}/{pages_n}")
+    def _page(i: int, /):
+        # The spilled pages not browsed to yet still count towards the page numbers
+        left = spilled.pages_left
+        return pages[i].set_author(name=f"Page {left+i+1}/{left+len(pages)}")
+
+    embed = _page(i)
     msg: hk.Message = await say(
         ctx,
         ensure_result=True,
@@ -443,18 +508,22 @@ async def queue_(
                 i = _i_ori
             elif key == 'next':
                 i += 1
-            elif key == 'prev':
+            elif key == 'prev' and i:
                 i -= 1
+            elif key == 'prev':
+                if older := await spilled.fetch(ctx, lvc, base):
+                    pages.insert(0, older)
+                    _i_ori += 1
             elif key == 'first':
                 i = 0
             elif key == 'last':
-                i = pages_n - 1
+                i = len(pages) - 1
             elif key == 'exit':
                 await inter.delete_initial_response()
                 return
 
             _row = _page_row(cancel_b=i == _i_ori)
-            embed = pages[i].set_author(name=f"Page {i+1}/{pages_n}")
+            embed = _page(i)
 
             await inter.edit_initial_response(
                 embed=embed,
@@ -500,7 +569,7 @@ async def lyrics_(
             )
             return
         else:
-            song = np.track.info.title
+            song = np.title
 
     # import cProfile
     # import pstats
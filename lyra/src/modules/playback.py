@@ -26,6 +26,7 @@ from ..lib.cmd import (
 )
 from ..lib.lava import (
     get_data,
+    is_connected,
     access_data,
     get_queue,
     access_queue,
@@ -40,6 +41,7 @@ from ..lib.playback import (
     stop,
     while_stop,
 )
+from ..lib.queue import to_queue_index
 
 
 playback = __init_component__(__name__)
@@ -81,7 +83,7 @@ async def on_voice_state_update(
     new = event.state
     old = event.old_state
 
-    if not await lvc.get_guild_node(event.guild_id):
+    if not is_connected(event.guild_id):
         return
 
     bot_u = bot.get_me()
@@ -267,7 +269,7 @@ async def fastforward_(
 ):
     async with access_queue(ctx, lvc) as q:
         assert not ((q.current is None) or (q.np_time is None))
-        np_info = q.current.track.info
+        np = q.current
         old_np_ms = q.np_time
         new_np_ms = old_np_ms + int(seconds * 1000)
 
@@ -277,7 +279,7 @@ async def fastforward_(
             await skip(ctx, lvc, change_stop=False)
             await say(
                 ctx,
-                content=f"❕⏭️ ~~`{np_info.title}`~~ *(The fast-forwarded time was too large; **Skipping** to the next track)*",
+                content=f"❕⏭️ ~~`{np.title}`~~ *(The fast-forwarded time was too large; **Skipping** to the next track)*",
             )
             return
         fmt_sec = f"{I if (I := int(seconds)) == seconds else f'{seconds:.3f}'}s"
@@ -359,14 +361,16 @@ with_playat_cmd_check_and_voting = with_cmd_composer(
 async def play_at_(
     ctx: tj.abc.Context,
     lvc: al.Injected[lv.Lavalink],
-    position: t.Annotated[ja.Int, "Play the track at what position?"],
+    track: t.Annotated[ja.Greedy[ja.Str], "Play the track by the name/position what?"],
 ):
     assert ctx.guild_id
 
     async with access_data(ctx.guild_id, lvc) as d:
         q = d.queue
         q.reset_repeat()
-        if not (1 <= position <= len(q)):
+        try:
+            i = to_queue_index(q, track)
+        except IllegalArgumentError:
             await err_say(
                 ctx,
                 content=f"❌ Invalid position. **The position must be between `1` and `{len(q)}`**",
@@ -374,14 +378,63 @@ async def play_at_(
             return
 
         async with while_stop(ctx, lvc, d):
-            t = q[position - 1]
-            q.pos = position - 1
+            t = q[i]
+            q.pos = i
+            await lvc.play(ctx.guild_id, t.track).start()
+            await set_pause(ctx, lvc, pause=False)
+
+        await say(
+            ctx,
+            content=f"🎿 Playing the track at position `{i + 1}` (`{t.title}`)",
+        )
+
+
+# /play-at-time
+
+
+@with_annotated_args_wrapped
+@with_playat_cmd_check_and_voting(C.PLAYATTIME)
+# -
+@tj.as_slash_command(
+    "play-at-time", "Plays the track that would be playing at a time into the queue"
+)
+@tj.as_message_command('play-at-time', 'playattime', 'pat', 'skiptotime', '->t')
+async def play_at_time_(
+    ctx: tj.abc.Context,
+    lvc: al.Injected[lv.Lavalink],
+    timestamp: t.Annotated[
+        ja.Converted[to_ms],
+        "How far into the queue? (Must be in format such as 2h, 1:30:00)",
+    ],
+):
+    assert ctx.guild_id
+
+    async with access_data(ctx.guild_id, lvc) as d:
+        q = d.queue
+        # The timestamp is into the whole queue, including the played tracks spilled out of it
+        if timestamp < q.spilled_durr:
+            await err_say(
+                ctx,
+                content=f"❌ The tracks in the first `{to_stamp(q.spilled_durr)}` of the queue have already been cleared from it",
+            )
+            return
+        if (i := q.index_at(timestamp - q.spilled_durr)) is None:
+            await err_say(
+                ctx,
+                content=f"❌ Invalid time. **The queue is only `{to_stamp(q.spilled_durr + q.total_durr)}` long**",
+            )
+            return
+
+        q.reset_repeat()
+        async with while_stop(ctx, lvc, d):
+            t = q[i]
+            q.pos = i
             await lvc.play(ctx.guild_id, t.track).start()
             await set_pause(ctx, lvc, pause=False)
 
         await say(
             ctx,
-            content=f"🎿 Playing the track at position `{position}` (`{t.track.info.title}`)",
+            content=f"🎿 Playing the track at `{to_stamp(timestamp)}` into the queue, position `{i + 1}` (`{t.title}`)",
         )
 
 
@@ -405,7 +458,7 @@ async def next_(
         await err_say(ctx, content="❗ This is the end of the queue")
         return
     await skip(ctx, lvc, change_stop=False)
-    await say(ctx, content=f"⏭️ **`{up.track.info.title}`**")
+    await say(ctx, content=f"⏭️ **`{up.title}`**")
 
 
 # /previous
@@ -41,6 +41,7 @@ from ..lib.queue import (
     to_tracks,
     remove_tracks,
     remove_track,
+    remove_duplicate_tracks,
     insert_track,
     shuffle_abs,
     repeat_abs,
@@ -263,7 +264,7 @@ async def remove_one_(
             content=f"❌ Invalid position. **The track position must be between `{arg_exp[0]}` and `{arg_exp[1]}`**",
         )
         return
-    await say(ctx, content=f"**`ー`** Removed `{rm.track.info.title}` from the queue")
+    await say(ctx, content=f"**`ー`** Removed `{rm.title}` from the queue")
 
 
 ## /remove bulk
@@ -317,6 +318,27 @@ async def remove_bulk_(
         )
 
 
+## /remove duplicates
+
+
+@with_strict_stage_cmd_check(C.REMOVE_DUPLICATES)
+# -
+@remove_g_m.as_sub_command('duplicates', 'dupes', 'dup', 'dd', '2')
+@remove_g_s.as_sub_command(
+    'duplicates', "Removes every repeat of a track from the queue, keeping the first"
+)
+async def remove_duplicates_(
+    ctx: tj.abc.Context,
+    lvc: al.Injected[lv.Lavalink],
+) -> None:
+    assert ctx.guild_id
+
+    if not (n := await remove_duplicate_tracks(ctx, lvc)):
+        await err_say(ctx, content="❗ There are no duplicate tracks in the queue")
+        return
+    await say(ctx, content=f"**`≡⁻`** Removed `{n} duplicate tracks` from the queue")
+
+
 # /clear
 
 
@@ -379,8 +401,8 @@ async def move_last_(
     ctx: tj.abc.Context,
     lvc: al.Injected[lv.Lavalink],
     track: t.Annotated[
-        Option[ja.Positional[ja.Int]],
-        "Position of the track? (If not given, the current position)",
+        Option[ja.Positional[ja.Greedy[ja.Str]]],
+        "The track by the name/position what? (If not given, the current track)",
     ] = None,
 ):
     """Moves the selected track to the end of the queue"""
@@ -405,7 +427,7 @@ async def move_last_(
 
     await say(
         ctx,
-        content=f"⏬ Moved track `{mv.track.info.title}` to the end of the queue",
+        content=f"⏬ Moved track `{mv.title}` to the end of the queue",
     )
 
 
@@ -456,7 +478,7 @@ async def move_swap_(
             )
             return
 
-        q[i_1st], q[i_2nd] = q[i_2nd], q[i_1st]
+        q.swap(i_1st, i_2nd)
         q.reset_repeat()
         if q.pos in {i_1st, i_2nd}:
             async with while_stop(ctx, lvc, d):
@@ -466,7 +488,7 @@ async def move_swap_(
 
     await say(
         ctx,
-        content=f"🔄 Swapped tracks `{q[i_2nd].track.info.title}` and `{q[i_1st].track.info.title}` in the queue",
+        content=f"🔄 Swapped tracks `{q[i_2nd].title}` and `{q[i_1st].title}` in the queue",
     )
 
 
@@ -483,8 +505,8 @@ async def move_insert_(
     lvc: al.Injected[lv.Lavalink],
     position: t.Annotated[ja.Int, "Where to insert the track?"],
     track: t.Annotated[
-        Option[ja.Positional[ja.Int]],
-        "Position of the track? (If not given, the current position)",
+        Option[ja.Positional[ja.Greedy[ja.Str]]],
+        "The track by the name/position what? (If not given, the current track)",
     ] = None,
 ):
     """
@@ -514,7 +536,7 @@ async def move_insert_(
     else:
         await say(
             ctx,
-            content=f"⤴️ Inserted track `{mv.track.info.title}` at position `{position}`",
+            content=f"⤴️ Inserted track `{mv.title}` at position `{position}`",
         )
 
 